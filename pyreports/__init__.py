@@ -30,14 +30,34 @@ from .exception import ReportDataError, ReportManagerError, DataObjectError  # n
 from .datatools import (
     average,  # noqa: F401
     most_common,  # noqa: F401
+    heavy_hitters,  # noqa: F401
     percentage,  # noqa: F401
+    percentages,  # noqa: F401
+    describe,  # noqa: F401
+    statistics,  # noqa: F401
+    group_by,  # noqa: F401
+    join,  # noqa: F401
     counter,  # noqa: F401
+    approx_distinct,  # noqa: F401
     aggregate,  # noqa: F401
     chunks,  # noqa: F401
     merge,  # noqa: F401
+    chain,  # noqa: F401
     deduplicate,  # noqa: F401
     subset,  # noqa: F401
     sort,  # noqa: F401
+    external_sort,  # noqa: F401
+    top_k,  # noqa: F401
+    sample,  # noqa: F401
+    columnar,  # noqa: F401
+    ColumnarDataset,  # noqa: F401
+    ChainedDataset,  # noqa: F401
+    DatasetView,  # noqa: F401
+    Comparison,  # noqa: F401
+    Expression,  # noqa: F401
+    GroupBy,  # noqa: F401
+    Statistics,  # noqa: F401
+    HyperLogLog,  # noqa: F401
     DataObject,  # noqa: F401
     DataAdapters,  # noqa: F401
     DataPrinters,  # noqa: F401
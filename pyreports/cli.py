@@ -227,10 +227,21 @@ def main():
             # Make a report object
             data = get_data(manager, input_.get("params"))
             # Check if sort is specified
+            limit = None
             if report.get("report").get("sort"):
                 column = report.get("report").get("sort").get("column")
                 reverse = report.get("report").get("sort").get("reverse")
-                data = pyreports.sort(data, column, reverse=reverse)
+                limit = report.get("report").get("sort").get("limit")
+                # Sort only the first rows, if limit is specified and
+                # nothing else removes rows; otherwise, the report keeps them
+                if limit is not None and not any(
+                    report.get("report").get(section)
+                    for section in ("filters", "deduplicate", "subset")
+                ):
+                    data = pyreports.top_k(data, column, limit, reverse=bool(reverse))
+                    limit = None
+                else:
+                    data = pyreports.sort(data, column, reverse=reverse)
             # Check if deduplicate is specified
             if report.get("report").get("deduplicate"):
                 data = pyreports.deduplicate(data)
@@ -253,6 +264,7 @@ def main():
                 output=make_manager(report.get("report").get("output"))
                 if "output" in report.get("report")
                 else None,
+                limit=limit,
             )
             print_verbose(f'created report "{report_.title}"', verbose=args.verbose)
         except Exception as err:
@@ -25,13 +25,44 @@
 # region Imports
 import os
 import ssl
+import copy
+import pickle
+import asyncio
+import inspect
 import tablib
 import smtplib
+import warnings
+from array import array
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from itertools import islice, repeat, chain as chain_iterables
+from concurrent.futures import ProcessPoolExecutor
+from tablib.core import Row
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email import encoders
 from email.mime.base import MIMEBase
-from .datatools import DataAdapters, DataPrinters
+from tablib.exceptions import HeadersNeeded, InvalidDimensions
+from .datatools import (
+    DataAdapters,
+    DataPrinters,
+    ColumnarDataset,
+    ChainedDataset,
+    DatasetView,
+    Comparison,
+    Expression,
+    GroupBy,
+    columnar,
+    top_k,
+    numpy,
+    _column_index,
+    _extend,
+    _hash_join,
+    _join_plan,
+    _iter_fields,
+    _fields_at,
+    _numeric_array,
+)
 from .io import Manager, WRITABLE_MANAGER
 from .exception import (
     ReportManagerError,
@@ -41,41 +72,435 @@ from .exception import (
 )
 
 
+# endregion
+
+# region Globals
+# Typecode for selection vectors: unsigned, at least 4 bytes
+INDEX_TYPECODE = "I" if array("I").itemsize >= 4 else "L"
+
+# endregion
+
+# region Functions
+
+
+def _filter_passes(flist=None, key=None, index=None, negation=False):
+    """Build the row test used by Executor.filter
+
+    :param flist: list of values (equal operator)
+    :param key: function that takes a single argument and returns data
+    :param index: resolved column index, or None for the whole row
+    :param negation: enable negation for flist or key
+    :return: function that returns how many filters a row passes (0, 1 or 2)
+    """
+    flist = list(flist) if flist else []
+    key = key if callable(key) else None
+    # Hash filter values when possible; fall back on linear scan otherwise
+    try:
+        values = frozenset(flist)
+    except TypeError:
+        values = None
+
+    def in_list(fields):
+        if values is not None:
+            try:
+                if negation:
+                    return not values.issubset(fields)
+                return not values.isdisjoint(fields)
+            except TypeError:
+                pass
+        if negation:
+            return any(f not in fields for f in flist)
+        return any(f in fields for f in flist)
+
+    def by_key(fields):
+        matched = any(key(field) for field in fields)
+        return not matched if negation else matched
+
+    def passes(row):
+        fields = row if index is None else (row[index],)
+        return bool(flist and in_list(fields)) + bool(key and by_key(fields))
+
+    return passes
+
+
+def _map_rows(rows, key=None, transforms=None):
+    """Apply map functions to rows
+
+    :param rows: iterable of list of fields
+    :param key: function applied to all fields
+    :param transforms: list of (column index, function) used instead of key
+    :return: generator
+    """
+    if transforms is None:
+        # Apply function to all fields
+        for fields in rows:
+            yield [key(field) for field in fields]
+    else:
+        for fields in rows:
+            new_row = list(fields)
+            for index, func in transforms:
+                new_row[index] = func(new_row[index])
+            yield new_row
+
+
+def _map_chunk(rows, key=None, transforms=None):
+    """Apply map functions to a chunk of rows, into a worker process
+
+    :param rows: list of list of fields
+    :param key: function applied to all fields
+    :param transforms: list of (column index, function) used instead of key
+    :return: list
+    """
+    return list(_map_rows(rows, key, transforms))
+
+
+def _map_parallel(rows, key=None, transforms=None, workers=None, chunksize=10000):
+    """Apply map functions to chunks of rows into a pool of processes
+
+    :param rows: iterable of list of fields
+    :param key: function applied to all fields
+    :param transforms: list of (column index, function) used instead of key
+    :param workers: number of processes
+    :param chunksize: rows sent to a process at a time
+    :return: generator
+    """
+    rows = iter(rows)
+    chunks = iter(lambda: list(islice(rows, chunksize)), [])
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Results are returned in the order of chunks
+        for chunk in pool.map(_map_chunk, chunks, repeat(key), repeat(transforms)):
+            yield from chunk
+
+
+def _map_batches(rows, key=None, transforms=None, batch=10000):
+    """Apply batched map functions to chunks of columns
+
+    :param rows: iterable of list of fields
+    :param key: function applied to chunks of all columns
+    :param transforms: list of (column index, function) used instead of key
+    :param batch: number of rows of a chunk
+    :return: generator
+    """
+    rows = iter(rows)
+    for chunk in iter(lambda: [list(fields) for fields in islice(rows, batch)], []):
+        if transforms is None:
+            functions = [(index, key) for index in range(len(chunk[0]))]
+        else:
+            functions = transforms
+        for index, func in functions:
+            values = func([fields[index] for fields in chunk])
+            if len(values) != len(chunk):
+                raise ExecutorDataError(
+                    f"batched function returns {len(values)} values, "
+                    f"expected {len(chunk)}"
+                )
+            if hasattr(values, "tolist"):
+                # Python objects from NumPy arrays
+                values = values.tolist()
+            for fields, value in zip(chunk, values):
+                fields[index] = value
+        yield from chunk
+
+
+async def _map_async(rows, key=None, transforms=None, concurrency=100):
+    """Apply map functions, also coroutine functions, to rows
+
+    :param rows: iterable of list of fields
+    :param key: function applied to all fields
+    :param transforms: list of (column index, function) used instead of key
+    :param concurrency: maximum number of rows and coroutines awaited at the same time
+    :return: list
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    rows = enumerate(rows)
+    results = []
+
+    async def call(func, value):
+        result = func(value)
+        if inspect.isawaitable(result):
+            async with semaphore:
+                result = await result
+        return result
+
+    async def map_row(fields):
+        if transforms is None:
+            return list(await asyncio.gather(*(call(key, field) for field in fields)))
+        new_row = list(fields)
+        values = await asyncio.gather(
+            *(call(func, new_row[index]) for index, func in transforms)
+        )
+        for (index, _), value in zip(transforms, values):
+            new_row[index] = value
+        return new_row
+
+    async def worker():
+        # Workers take the next row: only concurrency rows are in progress
+        for position, fields in rows:
+            results.append(None)
+            results[position] = await map_row(fields)
+
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    # Results are returned in the order of rows
+    return results
+
+
+def _memoize(func, maxsize):
+    """Cache results of function per argument, into a bounded LRU
+
+    :param func: function that takes a single argument
+    :param maxsize: maximum number of cached results
+    :return: function with cache_info attribute
+    """
+    # Typed: equal values of other types (1, 1.0, True) are not mixed up
+    cached = lru_cache(maxsize=maxsize, typed=True)(func)
+
+    def call(value):
+        try:
+            hash(value)
+        except TypeError:
+            # Unhashable values are not cached
+            return func(value)
+        return cached(value)
+
+    call.cache_info = cached.cache_info
+    return call
+
+
+def _build_index(values):
+    """Build a hash index of a column
+
+    :param values: values of a column
+    :return: dict {value: list of row indexes}, or None if values are unhashable
+    """
+    index = {}
+    try:
+        for position, value in enumerate(values):
+            positions = index.get(value)
+            if positions is None:
+                index[value] = [position]
+            else:
+                positions.append(position)
+    except TypeError:
+        return None
+    return index
+
+
+def _running_loop():
+    """Check if an event loop is running in this thread
+
+    :return: bool
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _copy_dataset(data):
+    """Copy rows and headers of a Dataset
+
+    :param data: Dataset object
+    :return: Dataset
+    """
+    if isinstance(data, ColumnarDataset):
+        return data.copy()
+    new_data = tablib.Dataset(title=data.title)
+    if isinstance(data, ChainedDataset):
+        new_data._data = [Row(fields) for fields in _iter_fields(data)]
+    else:
+        new_data._data = [Row(row._row, row.tags) for row in data._data]
+    new_data._dynamic_columns = dict(data._dynamic_columns)
+    new_data.headers = data.headers
+    return new_data
+
+
+def _snapshot(data):
+    """Dataset with the same rows of a Dataset: only the list of rows is copied
+
+    :param data: Dataset object
+    :return: Dataset
+    """
+    if isinstance(data, ColumnarDataset):
+        return data.copy()
+    if isinstance(data, ChainedDataset) and data._datasets is not None:
+        # Chained Datasets are read, not changed
+        new_data = copy.copy(data)
+        new_data.headers = data.headers and list(data.headers)
+        return new_data
+    new_data = tablib.Dataset(title=data.title)
+    new_data._data = list(data._data)
+    new_data._dynamic_columns = dict(data._dynamic_columns)
+    new_data.headers = data.headers and list(data.headers)
+    return new_data
+
+
+def _hand_out(data):
+    """Copy of a Dataset that doesn't share rows with it
+
+    :param data: Dataset object
+    :return: Dataset
+    """
+    if isinstance(data, ChainedDataset) and data._datasets is not None:
+        # Rows are read from the chained Datasets: changes copy them
+        return _snapshot(data)
+    return _copy_dataset(data)
+
+
+def _stamp(data):
+    """Stamp of the rows of a Dataset, that changes when rows are added or removed
+
+    :param data: Dataset object
+    :return: tuple
+    """
+    if isinstance(data, (ColumnarDataset, ChainedDataset)) or not data._data:
+        return data.height, None, None
+    # First and last Row objects: also a removed row followed by an added one
+    return data.height, id(data._data[0]), id(data._data[-1])
+
+
+def _optimize_plan(plan):
+    """Move cheap filters before the column maps that don't touch their column
+
+    :param plan: list of _Operation objects
+    :return: list
+    """
+    plan = list(plan)
+    for position, operation in enumerate(plan):
+        if not operation.cheap:
+            continue
+        target = position
+        while target > 0:
+            previous = plan[target - 1]
+            if previous.kind != "map" or previous.columns is None:
+                break
+            if operation.columns & previous.columns:
+                break
+            target -= 1
+        plan.insert(target, plan.pop(position))
+    return plan
+
+
 # endregion
 
 # region Classes
 
 
+class _Operation:
+    """Operation recorded into the plan of an Executor"""
+
+    def __init__(
+        self,
+        kind,
+        run,
+        columns=None,
+        cheap=False,
+        passes=None,
+        vector=None,
+        lookup=None,
+    ):
+        """Create _Operation object
+
+        :param kind: "filter", "map", "add" or "delete"
+        :param run: function that takes an iterable of rows and returns rows
+        :param columns: set of column indexes used, None means whole row
+        :param cheap: operation that can be moved before column maps
+        :param passes: row test of a filter operation
+        :param vector: function that takes data and returns a NumPy mask of
+            the rows that pass the filter, or None if columns are not numeric
+        :param lookup: values searched through the hash index of the column
+        """
+        self.kind = kind
+        self.run = run
+        self.columns = columns
+        self.cheap = cheap
+        self.passes = passes
+        self.vector = vector
+        self.lookup = lookup
+
+    def __repr__(self):
+        """Representation of _Operation object
+
+        :return: string
+        """
+        return f"<Operation {self.kind}, columns={self.columns}>"
+
+
 class Executor:
     """Executor receives, processes, transforms and writes data"""
 
-    def __init__(self, data, header=None):
+    def __init__(self, data, header=None, lazy=False):
         """Create Executor object
 
         :param data: everything type of data
         :param header: list header of data
+        :param lazy: record filter, map and column operations and run them
+            together in a single pass when data is requested
         """
+        self.lazy = lazy
+        self._plan = []
+        self._plan_headers = None
+        self._selection = None
+        self._origin = None
+        self._shared = False
+        self._cache_info = {}
+        self._indexes = {}
+        self._indexes_stamp = None
+        self._origin_stamp = None
+        self._scans = 0
+        self._origin_indexes = {}
         # Check type of input data
         err_msg = "input data must be a Dataset, tuple, list, List[dict] or List[tuple] object"
         if isinstance(data, (tuple, list)):
             if all((isinstance(obj, (tuple, list)) for obj in data)):
-                self.data = tablib.Dataset(*data)
+                self._replace(tablib.Dataset(*data))
             elif not all((isinstance(obj, (tuple, list)) for obj in data)):
-                self.data = tablib.Dataset()
-                self.data.append(data)
+                self._replace(tablib.Dataset())
+                self._data.append(data)
             else:
                 raise ExecutorError(err_msg)
         elif isinstance(data, dict):
-            self.data = tablib.Dataset(*list(data.values()))
+            self._replace(tablib.Dataset(*list(data.values())))
         elif isinstance(data, tablib.Dataset):
-            self.data = data
+            self._replace(data)
         else:
             raise ExecutorError(err_msg)
         # Set header
         if header or header is None:
             self.headers = header
-        self.origin = tablib.Dataset()
-        self.origin.extend(self.data)
+        # Origin is private: a Dataset of the caller is a snapshot of the list of rows;
+        # rows are shared with data until data is changed (copy-on-write)
+        if isinstance(data, tablib.Dataset):
+            self._origin = _snapshot(self._data)
+        else:
+            self._origin = self._data
+        self._shared = True
+        self._origin_stamp = _stamp(self._data)
+
+    @property
+    def data(self):
+        """Get dataset, running the pending operations first
+
+        :return: Dataset
+        """
+        return self.get_data()
+
+    @data.setter
+    def data(self, dataset):
+        """Set dataset, discarding the pending operations
+
+        :param dataset: Dataset object
+        :return: None
+        """
+        self._replace(dataset)
+
+    @property
+    def origin(self):
+        """Get a copy of original dataset
+
+        :return: Dataset
+        """
+        return _hand_out(self._origin)
 
     @property
     def headers(self):
@@ -83,7 +508,7 @@ class Executor:
 
         :return: None
         """
-        return self.data.headers
+        return self._pending_headers()
 
     @headers.setter
     def headers(self, header):
@@ -92,7 +517,246 @@ class Executor:
         :param header: header of data
         :return: None
         """
-        self.data.headers = header
+        self._own().headers = header
+
+    @property
+    def plan(self):
+        """Pending operations, in execution order
+
+        :return: list
+        """
+        return _optimize_plan(self._plan)
+
+    @property
+    def selection(self):
+        """Indexes of the filtered rows not yet gathered, over the rows of data
+
+        :return: array or None
+        """
+        self._prepare()
+        return self._selection
+
+    @property
+    def cache_info(self):
+        """Hits and misses of the cache of the last memoized map, per column
+
+        :return: dict {column: CacheInfo}
+        """
+        return {column: info() for column, info in self._cache_info.items()}
+
+    def _replace(self, dataset):
+        """Replace data with a Dataset of the Executor, discarding the pending operations
+
+        :param dataset: Dataset object
+        :return: None
+        """
+        self._data = dataset
+        self._shared = False
+        self._plan = []
+        self._selection = None
+        self._indexes = {}
+        self._scans = 0
+
+    def _own(self):
+        """Copy data that is still shared with origin, before changing it
+
+        :return: Dataset
+        """
+        data = self._gathered()
+        if self._shared:
+            self._data = _copy_dataset(data)
+            self._shared = False
+        # Data is going to change
+        self._indexes = {}
+        self._scans = 0
+        return self._data
+
+    def _index(self, column, build=True):
+        """Hash index of a column of data, built on first use
+
+        :param column: column index
+        :param build: build the index if it doesn't exist
+        :return: dict {value: list of row indexes}, or None if values are unhashable
+        """
+        data, origin = self._data, self._origin
+        stamp = _stamp(data)
+        if self._shared and (data is origin or stamp == self._origin_stamp):
+            # Origin is private and never changed: its indexes are kept after reset
+            data, indexes = origin, self._origin_indexes
+        else:
+            if stamp != self._indexes_stamp:
+                # Rows were added or removed from outside (e.g. through get_data)
+                self._indexes, self._indexes_stamp = {}, stamp
+            indexes = self._indexes
+        if column not in indexes:
+            if not build:
+                return None
+            indexes[column] = _build_index(data.get_col(column))
+        return indexes[column]
+
+    def _positions(self, values, column):
+        """Sorted indexes of the rows of data that contain values into column
+
+        :param values: iterable of values
+        :param column: column index
+        :return: list, or None if the column can't be indexed
+        """
+        index = self._index(column)
+        if index is None:
+            return None
+        positions = []
+        try:
+            for value in set(values):
+                positions.extend(index.get(value, ()))
+        except TypeError:
+            return None
+        positions.sort()
+        return positions
+
+    def _pending_headers(self):
+        """Headers of data after the pending operations
+
+        :return: list or None
+        """
+        return self._plan_headers if self._plan else self._data.headers
+
+    def _record(self, operation, headers):
+        """Add an operation to plan; run it now if Executor is not lazy
+
+        :param operation: _Operation object
+        :param headers: headers of data after operation
+        :return: None
+        """
+        self._plan.append(operation)
+        self._plan_headers = headers
+        if not self.lazy:
+            try:
+                self._execute_plan()
+            except Exception:
+                # Error is raised to the caller: data stays as before operation
+                self._plan.pop()
+                raise
+
+    def _prepare(self):
+        """Run pending operations, if any
+
+        :return: None
+        """
+        if self._plan:
+            self._execute_plan()
+
+    def _execute_plan(self):
+        """Run all pending operations in a single pass over the rows
+
+        :return: None
+        """
+        plan, headers = _optimize_plan(self._plan), self._plan_headers
+        # Plan is cleared only if it succeeds: a failed plan raises again
+        # on the next read, instead of returning untransformed data
+        # Only filters: select rows without copying them
+        if all(operation.kind == "filter" for operation in plan):
+            self._selection = self._select(plan)
+            self._plan = []
+            return
+        rows = self._rows()
+        for operation in plan:
+            rows = operation.run(rows)
+        # New rows clear the plan
+        self._set_rows(rows, headers)
+
+    def _set_rows(self, rows, headers):
+        """Replace data with new rows, of the same storage type
+
+        :param rows: iterable of list of fields
+        :param headers: headers of new rows
+        :return: None
+        """
+        ret_data = tablib.Dataset()
+        ret_data._data = [Row(fields) for fields in rows]
+        ret_data.headers = headers
+        if isinstance(self._data, ColumnarDataset):
+            ret_data = columnar(ret_data)
+        self._replace(ret_data)
+
+    def _rows(self):
+        """Iterate over the fields of selected rows
+
+        :return: generator
+        """
+        data = self._data
+        if self._selection is None:
+            return _iter_fields(data)
+        return (_fields_at(data, index) for index in self._selection)
+
+    def _select(self, operations):
+        """Refine the selection vector through filter operations
+
+        :param operations: list of filter _Operation objects
+        :return: array
+        """
+        data, selection, tests = self._data, self._selection, []
+        for operation in operations:
+            if operation.lookup is not None:
+                column = next(iter(operation.columns))
+                positions = self._positions(operation.lookup, column)
+                if positions is None:
+                    tests.append(operation.passes)
+                elif selection is None:
+                    selection = positions
+                else:
+                    # Keep selected rows that are into the index
+                    positions = set(positions)
+                    selection = [i for i in selection if i in positions]
+                continue
+            mask = None
+            if operation.vector is not None:
+                mask = operation.vector(data)
+            if mask is None:
+                tests.append(operation.passes)
+                continue
+            # Filter whole columns through NumPy
+            if selection is None:
+                selection = numpy.flatnonzero(mask)
+            else:
+                indexes = numpy.asarray(selection)
+                selection = indexes[mask[indexes]]
+        if isinstance(selection, list):
+            selection = array(INDEX_TYPECODE, selection)
+        elif selection is not None and not isinstance(selection, array):
+            indexes, selection = selection, array(INDEX_TYPECODE)
+            selection.frombytes(indexes.astype(INDEX_TYPECODE).tobytes())
+        if not tests:
+            return selection
+        if selection is None:
+            rows = enumerate(_iter_fields(data))
+        else:
+            rows = ((index, _fields_at(data, index)) for index in selection)
+        selection = array(INDEX_TYPECODE)
+        for index, fields in rows:
+            count = 1
+            for passes in tests:
+                count *= passes(fields)
+                if not count:
+                    break
+            if count == 1:
+                selection.append(index)
+            elif count:
+                selection.extend([index] * count)
+        return selection
+
+    def _gather(self):
+        """Copy selected rows into a new Dataset
+
+        :return: None
+        """
+        if isinstance(self._data, ColumnarDataset):
+            self._replace(self._data.take(self._selection))
+            return
+        data = self._data
+        ret_data = tablib.Dataset()
+        ret_data._data = [Row(_fields_at(data, index)) for index in self._selection]
+        ret_data.headers = self._data.headers
+        self._replace(ret_data)
 
     def __len__(self):
         """Count data
@@ -106,21 +770,22 @@ class Executor:
 
         :return: next value
         """
-        return (row for row in self.data)
+        self._prepare()
+        return (tuple(fields) for fields in self._rows())
 
     def __str__(self):
         """Pretty representation of Executor object
 
         :return: string
         """
-        return str(self.data)
+        return str(self._gathered())
 
     def __repr__(self):
         """Representation of Executor object
 
         :return: string
         """
-        return f"<Executor object, rows={self.count_rows()}, header={self.data.headers if self.data.headers else None}>"
+        return f"<Executor object, rows={self.count_rows()}, header={self.headers if self.headers else None}>"
 
     def __getitem__(self, item):
         """Get row into Dataset object
@@ -128,7 +793,10 @@ class Executor:
         :param item: row (int)
         :return: row
         """
-        return self.data[item]
+        self._prepare()
+        if isinstance(item, int) and self._selection is not None:
+            return self._data[self._selection[item]]
+        return self._gathered()[item]
 
     def __delitem__(self, key):
         """Delete row into Dataset object
@@ -136,7 +804,7 @@ class Executor:
         :param key: row (int)
         :return: None
         """
-        del self.data[key]
+        del self._own()[key]
 
     def __contains__(self, item):
         """Check if item is in Dataset Executor object
@@ -144,11 +812,52 @@ class Executor:
         :param item: Any item
         :return: bool
         """
-        for row in self.data:
-            if item in row:
-                return True
-            return False
-        return False
+        self._prepare()
+        columns = range(self._data.width)
+        # The first test searches into rows; the next ones build indexes of all columns
+        self._scans += 1
+        build = self._scans > 1
+        if all(self._index(column, build) is not None for column in columns):
+            for column in columns:
+                positions = self._positions([item], column)
+                if positions is None:
+                    break
+                if self._selected(positions):
+                    return True
+            else:
+                return False
+        return any(item in fields for fields in self._rows())
+
+    def _selected(self, positions):
+        """Filter indexes of rows of data through the selection
+
+        :param positions: sorted list of row indexes
+        :return: list
+        """
+        selection = self._selection
+        if selection is None:
+            return positions
+        # Selection is sorted: search indexes through bisection
+        selected = []
+        for position in positions:
+            count = bisect_right(selection, position) - bisect_left(selection, position)
+            selected.extend([position] * count)
+        return selected
+
+    def lookup(self, value, column):
+        """Get rows that contain value into column, through a hash index of the column
+
+        :param value: value of column
+        :param column: column name or index
+        :return: list of rows
+        """
+        self._prepare()
+        column = _column_index(self._data.headers, column)
+        positions = self._positions([value], column)
+        if positions is None:
+            return [tuple(fields) for fields in self._rows() if fields[column] == value]
+        data = self._data
+        return [tuple(_fields_at(data, i)) for i in self._selected(positions)]
 
     def __add__(self, other):
         """Add row or extend Dataset
@@ -157,85 +866,260 @@ class Executor:
         :return: None
         """
         if isinstance(other, (list, tuple)):
-            self.data.append(other)
+            self._own().append(other)
         elif isinstance(other, tablib.Dataset):
-            for row in other:
-                self.data.append(row)
+            _extend(self._own(), other)
         else:
             raise ExecutorError(f"{other} is not list, tuple or Dataset object")
 
+    def _gathered(self):
+        """Current dataset, without handing out origin
+
+        :return: Dataset
+        """
+        self._prepare()
+        if self._selection is not None:
+            self._gather()
+        return self._data
+
     def get_data(self):
         """Get dataset
 
         :return: dataset
         """
-        return self.data
+        data = self._gathered()
+        if data is self._origin:
+            # Origin is private: rows could be changed in place (e.g. append_col)
+            self._data = _hand_out(data)
+            self._shared = False
+        return self._data
 
     def reset(self):
         """Reset data to original data
 
         :return: None
         """
-        self.data = tablib.Dataset()
-        self.data.extend(self.origin)
+        self._replace(self._origin)
+        self._shared = True
 
     def filter(self, flist=None, key=None, column=None, negation=False):
         """Filter data through a list of strings (equal operator) and/or function key
 
         :param flist: list of strings
-        :param key: function that takes a single argument and returns data
+        :param key: function that takes a single argument and returns data,
+            or expression on columns of rows (str or Expression)
         :param column: select column name or index number
         :param negation: enable negation for flist or key
         :return: None
         """
-        if flist is None:
-            flist = []
-        ret_data = tablib.Dataset(headers=self.data.headers)
-        # Filter data through filter list
-        for index, row in enumerate(self):
-            filtered_row = row if not column else (self.select_column(column)[index],)
-            for f in flist:
-                if negation:
-                    if f not in filtered_row:
-                        ret_data.append(row)
-                        break
-                else:
-                    if f in filtered_row:
-                        ret_data.append(row)
-                        break
-            # Filter data through function (key)
-            if key and callable(key):
-                if negation:
-                    if not any([bool(key(field)) for field in filtered_row]):
-                        ret_data.append(row)
-                        continue
-                else:
-                    if any([bool(key(field)) for field in filtered_row]):
-                        ret_data.append(row)
-                        continue
-        self.data = ret_data
+        headers = self._pending_headers()
+        if isinstance(key, (str, Expression)):
+            if flist:
+                raise ExecutorError("filter by list of values or by expression")
+            self._filter_expression(key, negation, headers)
+            return
+        # Resolve column once, then filter data in a single pass
+        index = _column_index(headers, column) if column else None
+        passes = _filter_passes(flist, key, index=index, negation=negation)
+
+        def run(rows):
+            for fields in rows:
+                # A row is added once for flist and once for key, when both match
+                for _ in range(passes(fields)):
+                    yield fields
+
+        columns = None if index is None else {index}
+        cheap = columns is not None and not callable(key)
+        vector = lookup = None
+        if columns and not flist and isinstance(key, Comparison) and key.numeric:
+            compare = key.negate if negation else key.mask
+
+            def vector(data):
+                values = _numeric_array(data, index)
+                return None if values is None else compare(values)
+
+        if columns and flist and key is None and not negation:
+            lookup = list(flist)
+        operation = _Operation(
+            "filter",
+            run,
+            columns,
+            cheap=cheap,
+            passes=passes,
+            vector=vector,
+            lookup=lookup,
+        )
+        self._record(operation, headers)
 
-    def map(self, key, column=None):
-        """Apply function to data
+    def _filter_expression(self, expression, negation, headers):
+        """Filter rows through an expression on columns
 
-        :param key: function that takes a single argument
-        :param column: select column name or index number
+        :param expression: str or Expression object
+        :param negation: enable negation
+        :param headers: headers of data
         :return: None
         """
-        if callable(key):
-            ret_data = tablib.Dataset(headers=self.data.headers)
-            for index, row in enumerate(self):
-                filtered_row = (
-                    row if not column else (self.select_column(column)[index],)
-                )
-                # Apply function to data
-                new_row = list()
-                for field in filtered_row:
-                    new_row.append(key(field))
-                ret_data.append(new_row)
-            self.data = ret_data
+        if isinstance(expression, str):
+            expression = Expression(expression)
+        predicate = expression.predicate(headers)
+        columns = set(expression.columns(headers).values())
+        vector = expression.vector(headers)
+
+        def passes(fields):
+            return predicate(fields) != negation
+
+        def run(rows):
+            return filter(passes, rows)
+
+        if vector is not None and negation:
+            positive = vector
+
+            def vector(data):
+                mask = positive(data)
+                return None if mask is None else ~mask
+
+        operation = _Operation(
+            "filter",
+            run,
+            columns,
+            cheap=True,
+            passes=passes,
+            vector=vector,
+        )
+        self._record(operation, headers)
+
+    def _map_functions(self, key, column, headers):
+        """Resolve map functions and columns
+
+        :param key: function that takes a single argument, or dict {column: function}
+        :param column: select column name, index number or a list of them
+        :param headers: headers of data
+        :return: tuple (key, transforms, columns)
+        """
+        if isinstance(key, dict):
+            funcs = key
+        elif callable(key):
+            if column is None:
+                funcs = None
+            elif isinstance(column, (list, tuple)):
+                funcs = {col: key for col in column}
+            else:
+                funcs = {column: key}
         else:
             raise ExecutorDataError(f"{key} isn't function object")
+        if funcs is None:
+            return key, None, None
+        for func in funcs.values():
+            if not callable(func):
+                raise ExecutorDataError(f"{func} isn't function object")
+        # Resolve columns once, then change only them in a single pass
+        transforms = [
+            (_column_index(headers, col), func) for col, func in funcs.items()
+        ]
+        return None, transforms, {index for index, _ in transforms}
+
+    def map(
+        self,
+        key,
+        column=None,
+        workers=None,
+        chunksize=10000,
+        concurrency=100,
+        cache=None,
+        batch=None,
+    ):
+        """Apply function to data
+
+        :param key: function that takes a single argument, or dict {column: function}
+        :param column: select column name, index number or a list of them
+        :param workers: number of processes that apply function to chunks of data
+        :param chunksize: number of rows sent to a process at a time
+        :param concurrency: maximum number of coroutines awaited at the same time,
+            when function is a coroutine function
+        :param cache: maximum number of results cached per column, for pure functions
+        :param batch: number of rows of the column chunks passed to function,
+            that takes a list of values and returns the same number of values
+        :return: None
+        """
+        headers = self._pending_headers()
+        key, transforms, columns = self._map_functions(key, column, headers)
+        functions = [key] if transforms is None else [f for _, f in transforms]
+        is_async = any(asyncio.iscoroutinefunction(func) for func in functions)
+        if (
+            isinstance(chunksize, bool)
+            or not isinstance(chunksize, int)
+            or chunksize < 1
+        ):
+            raise ExecutorError("chunksize must be an integer greater than zero")
+        if batch is not None:
+            if isinstance(batch, bool) or not isinstance(batch, int) or batch < 1:
+                raise ExecutorError("batch must be an integer greater than zero")
+            if workers or is_async or cache is not None:
+                raise ExecutorError(
+                    "batch can't be used with workers, cache or coroutine functions"
+                )
+
+            def run(rows):
+                return _map_batches(rows, key, transforms, batch)
+
+            self._record(_Operation("map", run, columns), headers)
+            return
+        if cache is not None:
+            if workers or is_async:
+                raise ExecutorError(
+                    "cache can't be used with workers or coroutine functions"
+                )
+            if transforms is None:
+                key = _memoize(key, cache)
+                self._cache_info = {None: key.cache_info}
+            else:
+                transforms = [(i, _memoize(f, cache)) for i, f in transforms]
+                self._cache_info = {
+                    headers[i] if headers else i: f.cache_info for i, f in transforms
+                }
+        if is_async:
+            message = (
+                "into a running event loop, use amap method for coroutine functions"
+            )
+            if _running_loop():
+                raise ExecutorError(message)
+
+            def run(rows):
+                # A lazy plan could run into an event loop
+                if _running_loop():
+                    raise ExecutorError(message)
+                return iter(asyncio.run(_map_async(rows, key, transforms, concurrency)))
+
+            self._record(_Operation("map", run, columns), headers)
+            return
+        if workers:
+            # Functions must be sent to processes: check it before
+            try:
+                pickle.dumps((key, transforms))
+            except (pickle.PicklingError, AttributeError, TypeError) as err:
+                warnings.warn(f"map runs in this process: {err}", RuntimeWarning)
+                workers = None
+
+        def run(rows):
+            if workers:
+                return _map_parallel(rows, key, transforms, workers, chunksize)
+            return _map_rows(rows, key, transforms)
+
+        self._record(_Operation("map", run, columns), headers)
+
+    async def amap(self, key, column=None, concurrency=100):
+        """Apply function, also coroutine function, to data into the running event loop
+
+        :param key: function that takes a single argument, or dict {column: function}
+        :param column: select column name, index number or a list of them
+        :param concurrency: maximum number of coroutines awaited at the same time
+        :return: None
+        """
+        self._prepare()
+        headers = self._data.headers
+        key, transforms, _ = self._map_functions(key, column, headers)
+        rows = await _map_async(self._rows(), key, transforms, concurrency)
+        self._set_rows(rows, headers)
 
     def select_column(self, column):
         """Filter dataset by column
@@ -243,10 +1127,11 @@ class Executor:
         :param column: name or index of column
         :return: Dataset object
         """
-        if isinstance(column, int):
-            return self.data.get_col(column)
-        else:
-            return self.data[column]
+        self._prepare()
+        index = _column_index(self._data.headers, column)
+        if self._selection is None:
+            return self._data.get_col(index)
+        return [fields[index] for fields in self._rows()]
 
     def add_column(self, column, value):
         """Add column to data
@@ -255,7 +1140,34 @@ class Executor:
         :param value: list value for column, or function with no arguments that returns a value
         :return: None
         """
-        self.data.append_col(value, header=column)
+        if not self.lazy:
+            self._own().append_col(value, header=column)
+            return
+        headers = self._pending_headers()
+        if headers:
+            if not column:
+                raise HeadersNeeded()
+            headers = headers + [column]
+
+        if callable(value):
+
+            def run(rows):
+                for fields in rows:
+                    yield fields + [value(fields)]
+
+        else:
+            values = list(value)
+
+            def run(rows):
+                count = 0
+                for count, fields in enumerate(rows, start=1):
+                    if count > len(values):
+                        raise InvalidDimensions("the column is not the same length")
+                    yield fields + [values[count - 1]]
+                if count != len(values):
+                    raise InvalidDimensions("the column is not the same length")
+
+        self._record(_Operation("add", run), headers)
 
     def del_column(self, column):
         """Delete column
@@ -263,28 +1175,140 @@ class Executor:
         :param column: column name
         :return: None
         """
-        del self.data[column]
+        if not self.lazy or not isinstance(column, str):
+            del self._own()[column]
+            return
+        headers = self._pending_headers()
+        index = _column_index(headers, column)
+        headers = headers[:index] + headers[index + 1 :]
+
+        def run(rows):
+            for fields in rows:
+                yield fields[:index] + fields[index + 1 :]
+
+        self._record(_Operation("delete", run), headers)
 
     def count_rows(self):
         """Count all rows
 
         :return: integer
         """
-        return len(self.data)
+        self._prepare()
+        if self._selection is not None:
+            return len(self._selection)
+        return len(self._data)
+
+    def partition(self, predicates, rest=None):
+        """Split rows into Datasets, in a single pass; a row goes into every
+        Dataset whose predicate is true
+
+        :param predicates: dict {name: function that takes a row, or expression}
+        :param rest: name of the Dataset of rows that match no predicate
+        :return: dict {name: Dataset}
+        """
+        self._prepare()
+        data, headers = self._data, self._data.headers
+        tests = []
+        for name, predicate in predicates.items():
+            if isinstance(predicate, (str, Expression)):
+                if isinstance(predicate, str):
+                    predicate = Expression(predicate)
+                vector = predicate.vector(headers)
+                mask = None if vector is None else vector(data)
+                if mask is not None:
+                    # Evaluated on whole columns through NumPy
+                    tests.append((name, None, mask.tolist()))
+                    continue
+                predicate = predicate.predicate(headers)
+            elif not callable(predicate):
+                raise ExecutorDataError(f"{predicate} isn't function object")
+            tests.append((name, predicate, None))
+        buckets = {name: [] for name in predicates}
+        if rest is not None:
+            buckets[rest] = []
+        positions = range(len(data)) if self._selection is None else self._selection
+        for position, fields in zip(positions, self._rows()):
+            matched = False
+            for name, predicate, mask in tests:
+                if mask[position] if predicate is None else predicate(fields):
+                    buckets[name].append(Row(list(fields)))
+                    matched = True
+            if not matched and rest is not None:
+                buckets[rest].append(Row(list(fields)))
+        datasets = {}
+        for name, rows in buckets.items():
+            datasets[name] = tablib.Dataset()
+            datasets[name]._data = rows
+            datasets[name].headers = headers
+            if isinstance(data, ColumnarDataset):
+                datasets[name] = columnar(datasets[name])
+        return datasets
+
+    def top_k(self, column, k, reverse=False):
+        """Keep only the first k rows of data sorted by column, without sorting all rows
+
+        :param column: column name or index
+        :param k: number of rows
+        :param reverse: reversed order (k greatest values)
+        :return: None
+        """
+        self._replace(top_k(self._gathered(), column, k, reverse=reverse))
+
+    def join(self, other, on, how="inner"):
+        """Join data with other data through a hash table on the smaller one:
+        inner, left (None for the missing fields), semi or anti (rows with or without a match)
+
+        :param other: Executor or Dataset object, or iterable of Dataset objects
+            (chunks) streamed through a hash table of data
+        :param on: column name or index, or list of them, of both data
+        :param how: "inner", "left", "semi" or "anti"
+        :return: None
+        """
+        if isinstance(other, Executor):
+            other = other._gathered()
+        if isinstance(other, tablib.Dataset):
+            chunks, height = iter([other]), other.height
+        else:
+            try:
+                chunks, height = iter(other), None
+            except TypeError:
+                raise ExecutorError(f"{other} is not Executor or Dataset object")
+        first = next(chunks, None)
+        if not isinstance(first, tablib.Dataset):
+            raise ExecutorError(f"{other} is not Executor or Dataset object")
+        self._prepare()
+        keys, headers = _join_plan(self._data.headers, first, on, how)
+
+        def fields():
+            for chunk in chain_iterables([first], chunks):
+                if not isinstance(chunk, tablib.Dataset):
+                    raise ExecutorError(f"{chunk} is not a Dataset object")
+                yield from _iter_fields(chunk)
+
+        rows = _hash_join(self._rows(), self.count_rows(), fields(), height, keys, how)
+        self._set_rows(rows, headers)
+
+    def group_by(self, *columns):
+        """Group rows by columns, to aggregate them through agg method
+
+        :param columns: columns name or index of group keys
+        :return: GroupBy
+        """
+        return GroupBy(self._gathered(), *columns)
 
     def count_columns(self):
         """Count all column
 
         :return: integer
         """
-        return len(self.data.headers)
+        return len(self.headers)
 
     def clone(self):
         """Clone Executor object
 
         :return: executor
         """
-        return Executor(self.origin, header=self.origin.headers)
+        return Executor(self.origin, header=self._origin.headers, lazy=self.lazy)
 
 
 class Report(DataAdapters, DataPrinters):
@@ -300,6 +1324,7 @@ class Report(DataAdapters, DataPrinters):
         column=None,
         count=False,
         output: Manager = None,
+        limit=None,
     ):
         """Create Report object
 
@@ -311,6 +1336,7 @@ class Report(DataAdapters, DataPrinters):
         :param column: select column name or index
         :param count: count rows
         :param output: Manager object
+        :param limit: keep only the first rows of report, after filters
         """
         # Discard all objects that are not Datasets
         DataAdapters.__init__(self, input_data=input_data)
@@ -321,6 +1347,7 @@ class Report(DataAdapters, DataPrinters):
         self.negation = negation
         self.column = column
         self.count = bool(count)
+        self.limit = limit
         if isinstance(output, Manager) or output is None:
             if output:
                 if output.__class__.__name__ not in WRITABLE_MANAGER:
@@ -407,20 +1434,23 @@ class Report(DataAdapters, DataPrinters):
         :return: None
         """
         # Create a temporary Executor object
-        ex = Executor(self.data, header=self.data.headers)
+        ex = Executor(self.data, header=self.data.headers, lazy=True)
         # Apply map function
         if self.map:
             ex.map(self.map)
         # Apply filters
         if self.filter:
-            if callable(self.filter):
+            if callable(self.filter) or isinstance(self.filter, str):
                 ex.filter(key=self.filter, negation=self.negation, column=column)
             else:
                 ex.filter(self.filter, negation=self.negation, column=column)
+        self._report = ex.get_data()
+        # Keep only the first rows
+        if self.limit is not None and self._report.height > self.limit:
+            self._report = DatasetView(self._report, stop=self.limit).copy()
         # Count element
         if bool(self.count):
-            self.count = len(ex)
-        self._report = ex.get_data()
+            self.count = len(self._report)
 
     def export(self):
         """Process and save data on output
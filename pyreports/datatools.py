@@ -23,10 +23,51 @@
 """Contains all functions for data processing."""
 
 # region Imports
+import ast
+import sys
+import copy
+import math
+import heapq
+import hashlib
+import pickle
+import random
+import operator
+import tempfile
 from .exception import DataObjectError
+from array import array
+from bisect import bisect_right
+from itertools import accumulate, chain as chain_iterables
 from collections import Counter
 from tablib import Dataset, InvalidDimensions
+from tablib.core import Row
+from tablib.exceptions import HeadersNeeded
 
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+
+# endregion
+
+# region Globals
+AGGREGATES = ("count", "sum", "mean", "min", "max", "std")
+JOINS = ("inner", "left", "semi", "anti")
+SAMPLES = ("reservoir", "bernoulli", "stratified")
+# Reducers of group_by: (first state, next state, result)
+REDUCERS = {
+    "count": (lambda value: 1, lambda state, value: state + 1, None),
+    "sum": (None, operator.add, None),
+    "mean": (
+        lambda value: (value, 1),
+        lambda state, value: (state[0] + value, state[1] + 1),
+        lambda state: state[0] / state[1],
+    ),
+    "min": (None, min, None),
+    "max": (None, max, None),
+    "first": (None, lambda state, value: state, None),
+    "last": (None, lambda state, value: value, None),
+}
 
 # endregion
 
@@ -104,10 +145,10 @@ class DataAdapters(DataObject):
         Yield successive n-sized chunks from Dataset
 
         :param length: n-sized chunks
-        :return: generator
+        :return: generator of DatasetView, without copying rows
         """
         for idx in range(0, len(self.data), length):
-            yield self.data[idx : idx + length]
+            yield DatasetView(self.data, idx, idx + length)
 
     def deduplicate(self):
         """Remove duplicated rows
@@ -133,6 +174,27 @@ class DataAdapters(DataObject):
         """
         return self.data.sort(col=column, reverse=reverse)
 
+    def top_k(self, column, k, reverse=False):
+        """First k rows of the Dataset sorted by a specific column
+
+        :param column: column to sort
+        :param k: number of rows
+        :param reverse: reversed order (k greatest values)
+        :return: Dataset
+        """
+        return top_k(self.data, column, k, reverse=reverse)
+
+    def sample(self, n, method="reservoir", by=None, seed=None):
+        """Random sample of rows of the Dataset, in a single pass
+
+        :param n: number of rows (per value of by, if stratified); fraction of rows if bernoulli
+        :param method: reservoir, bernoulli or stratified
+        :param by: column of strata, if stratified
+        :param seed: seed of random generator
+        :return: Dataset
+        """
+        return sample(self.data, n, method=method, by=by, seed=seed)
+
     def __iter__(self):
         return (row for row in self.data)
 
@@ -158,13 +220,23 @@ class DataPrinters(DataObject):
         """
         return average(self.data, column)
 
-    def most_common(self, column):
+    def most_common(self, column, n=None):
         """The most common element in a column
 
         :param column: column name or index
-        :return: Any
+        :param n: number of most common elements with their count
+        :return: Any, or list of tuple (element, count) if n is specified
         """
-        return most_common(self.data, column)
+        return most_common(self.data, column, n)
+
+    def heavy_hitters(self, column, k=100):
+        """Approximate most common elements in a column, into bounded memory
+
+        :param column: column name or index
+        :param k: maximum number of counted elements
+        :return: list of tuple (element, count)
+        """
+        return heavy_hitters(self.data, column, k)
 
     def percentage(self, filter_):
         """Calculating the percentage according to filter
@@ -174,6 +246,42 @@ class DataPrinters(DataObject):
         """
         return percentage(self.data, filter_)
 
+    def percentages(self, filters, column=None):
+        """Calculating the percentage according to many filters, in a single pass
+
+        :param filters: equality filters
+        :param column: column name or index; all columns if not specified
+        :return: dict
+        """
+        return percentages(self.data, filters, column)
+
+    def describe(self, column, *aggregates):
+        """Aggregates of a column of integers or floats
+
+        :param column: column name or index
+        :param aggregates: names of aggregates; all if not specified
+        :return: dict
+        """
+        return describe(self.data, column, *aggregates)
+
+    def statistics(self, column, compression=100):
+        """Streaming statistics of a column of integers or floats
+
+        :param column: column name or index
+        :param compression: accuracy of percentiles (greater keeps more centroids)
+        :return: Statistics
+        """
+        return statistics(self.data, column, compression)
+
+    def approx_distinct(self, column, precision=12):
+        """Approximate number of distinct values of a column, through HyperLogLog
+
+        :param column: column name or index
+        :param precision: bits of the index of registers (2 ** precision bytes)
+        :return: int
+        """
+        return approx_distinct(self.data, column, precision)
+
     def __repr__(self):
         """Representation of DataObject
 
@@ -196,10 +304,1271 @@ class DataPrinters(DataObject):
         return len(self.data)
 
 
+class Comparison:
+    """Comparison with a value, usable as key of Executor.filter
+
+    On columns of integers or floats, Executor evaluates it on the whole
+    column through NumPy, when installed.
+    """
+
+    OPERATORS = {
+        "==": operator.eq,
+        "!=": operator.ne,
+        "<": operator.lt,
+        "<=": operator.le,
+        ">": operator.gt,
+        ">=": operator.ge,
+    }
+
+    def __init__(self, operator_, value):
+        """Create Comparison object
+
+        :param operator_: comparison operator: ==, !=, <, <=, > or >=
+        :param value: value to compare with
+        """
+        if operator_ not in self.OPERATORS:
+            raise DataObjectError(f"{operator_} is not a comparison operator")
+        self.operator = operator_
+        self.value = value
+        self._compare = self.OPERATORS[operator_]
+
+    def __call__(self, item):
+        """Compare item with value; not comparable items are False
+
+        :param item: Any item
+        :return: bool
+        """
+        try:
+            return bool(self._compare(item, self.value))
+        except TypeError:
+            return False
+
+    def __repr__(self):
+        """Representation of Comparison object
+
+        :return: string
+        """
+        return f"<Comparison {self.operator} {self.value!r}>"
+
+    @property
+    def numeric(self):
+        """Value can be compared with a NumPy array
+
+        :return: bool
+        """
+        return numpy is not None and type(self.value) in (int, float)
+
+    def mask(self, values):
+        """Compare a NumPy array with value
+
+        :param values: NumPy array
+        :return: NumPy array of bool
+        """
+        return self._compare(values, self.value)
+
+    def negate(self, values):
+        """Negated comparison of a NumPy array with value
+
+        :param values: NumPy array
+        :return: NumPy array of bool
+        """
+        return ~self.mask(values)
+
+
+class Expression:
+    """Filter expression on columns, e.g. "age > 30 and dept in ('IT', 'HR')"
+
+    Parsed once and compiled into a function of the fields of a row;
+    on columns of integers or floats, Executor evaluates it on whole
+    columns through NumPy, when installed.
+    """
+
+    NODES = (
+        ast.Expression,
+        ast.BoolOp,
+        ast.And,
+        ast.Or,
+        ast.UnaryOp,
+        ast.Not,
+        ast.USub,
+        ast.UAdd,
+        ast.Compare,
+        ast.Eq,
+        ast.NotEq,
+        ast.Lt,
+        ast.LtE,
+        ast.Gt,
+        ast.GtE,
+        ast.In,
+        ast.NotIn,
+        ast.BinOp,
+        ast.Add,
+        ast.Sub,
+        ast.Mult,
+        ast.Div,
+        ast.Mod,
+        ast.Name,
+        ast.Load,
+        ast.Constant,
+        ast.Tuple,
+        ast.List,
+    )
+
+    def __init__(self, text):
+        """Create Expression object
+
+        :param text: expression of column names, constants, comparisons,
+            arithmetic operators, and, or, not
+        """
+        try:
+            tree = ast.parse(text.strip(), mode="eval")
+        except SyntaxError as err:
+            raise DataObjectError(f"invalid expression {text!r}: {err.msg}")
+        for node in ast.walk(tree):
+            if not isinstance(node, self.NODES):
+                raise DataObjectError(
+                    f"{type(node).__name__} is not allowed into expression {text!r}"
+                )
+        self.text = text
+        self._tree = tree
+        self.names = list(
+            dict.fromkeys(
+                node.id for node in ast.walk(tree) if isinstance(node, ast.Name)
+            )
+        )
+
+    def __repr__(self):
+        """Representation of Expression object
+
+        :return: string
+        """
+        return f"<Expression {self.text!r}>"
+
+    def columns(self, headers):
+        """Indexes of the columns used by expression
+
+        :param headers: headers of data
+        :return: dict {name: index}
+        """
+        return {name: _column_index(headers, name) for name in self.names}
+
+    def predicate(self, headers):
+        """Compile expression into a function of the fields of a row
+
+        :param headers: headers of data
+        :return: function that returns bool; not comparable values
+            and arithmetic errors (e.g. division by zero) are False
+        """
+        body = _ExpressionCompiler(self.columns(headers), "_row").visit(
+            copy.deepcopy(self._tree.body)
+        )
+        function = _compile_lambda(body, "_row", {})
+
+        def predicate(fields):
+            try:
+                return bool(function(fields))
+            except (TypeError, ArithmeticError):
+                return False
+
+        return predicate
+
+    def vector(self, headers):
+        """Compile expression into a function of the whole columns, through NumPy
+
+        :param headers: headers of data
+        :return: function that takes a Dataset and returns a NumPy array of bool
+            or None (not numeric columns), or None if NumPy or values can't be used
+        """
+        constants = [
+            node.value
+            for node in ast.walk(self._tree)
+            if isinstance(node, ast.Constant)
+        ]
+        if numpy is None or any(type(value) not in (int, float) for value in constants):
+            return None
+        columns = self.columns(headers)
+        body = _ExpressionCompiler(columns, "_columns", vector=True).visit(
+            copy.deepcopy(self._tree.body)
+        )
+        function = _compile_lambda(
+            body,
+            "_columns",
+            {
+                "_isin": numpy.isin,
+                "_and": numpy.logical_and,
+                "_or": numpy.logical_or,
+                "_not": numpy.logical_not,
+            },
+        )
+
+        def vector(data):
+            arrays = {}
+            for index in columns.values():
+                arrays[index] = _numeric_array(data, index)
+                if arrays[index] is None:
+                    return None
+            try:
+                with numpy.errstate(divide="raise", invalid="raise", over="ignore"):
+                    mask = numpy.asarray(function(arrays), dtype=bool)
+            except FloatingPointError:
+                # e.g. division by zero: the rows are evaluated like predicate
+                return None
+            return numpy.broadcast_to(mask, (data.height,))
+
+        return vector
+
+
+class _ExpressionCompiler(ast.NodeTransformer):
+    """Replace column names of an Expression with items of a variable"""
+
+    def __init__(self, columns, variable, vector=False):
+        """Create _ExpressionCompiler object
+
+        :param columns: dict {name: index}
+        :param variable: name of the variable of row or columns
+        :param vector: replace boolean operators with NumPy logical functions
+        """
+        self.columns = columns
+        self.variable = variable
+        self.vector = vector
+
+    def visit_Name(self, node):
+        index = ast.Constant(value=self.columns[node.id])
+        if sys.version_info < (3, 9):  # pragma: no cover
+            # Subscripts of Python 3.8 need an Index node
+            index = ast.Index(value=index)
+        return ast.Subscript(
+            value=ast.Name(id=self.variable, ctx=ast.Load()),
+            slice=index,
+            ctx=ast.Load(),
+        )
+
+    def visit_BoolOp(self, node):
+        self.generic_visit(node)
+        if not self.vector:
+            return node
+        function = "_and" if isinstance(node.op, ast.And) else "_or"
+        result = node.values[0]
+        for value in node.values[1:]:
+            result = _call(function, result, value)
+        return result
+
+    def visit_UnaryOp(self, node):
+        self.generic_visit(node)
+        if self.vector and isinstance(node.op, ast.Not):
+            return _call("_not", node.operand)
+        return node
+
+    def visit_Compare(self, node):
+        self.generic_visit(node)
+        if not self.vector:
+            return node
+        # a < b < c is logical_and(a < b, b < c)
+        result, left = None, node.left
+        for operator_, right in zip(node.ops, node.comparators):
+            if isinstance(operator_, (ast.In, ast.NotIn)):
+                test = _call("_isin", left, right)
+                if isinstance(operator_, ast.NotIn):
+                    test = _call("_not", test)
+            else:
+                test = ast.Compare(left=left, ops=[operator_], comparators=[right])
+            result = test if result is None else _call("_and", result, test)
+            left = right
+        return result
+
+
+def _call(function, *args):
+    """Call node of a function name
+
+    :param function: name of function
+    :param args: argument nodes
+    :return: ast.Call
+    """
+    return ast.Call(
+        func=ast.Name(id=function, ctx=ast.Load()), args=list(args), keywords=[]
+    )
+
+
+def _compile_lambda(body, argument, namespace):
+    """Compile an expression node into a function of a single argument
+
+    :param body: expression node
+    :param argument: name of the argument
+    :param namespace: names available to the expression
+    :return: function
+    """
+    function = ast.Expression(
+        body=ast.Lambda(
+            args=ast.arguments(
+                posonlyargs=[],
+                args=[ast.arg(arg=argument)],
+                kwonlyargs=[],
+                kw_defaults=[],
+                defaults=[],
+            ),
+            body=body,
+        )
+    )
+    code = compile(ast.fix_missing_locations(function), "<expression>", "eval")
+    return eval(code, {"__builtins__": {}, **namespace})
+
+
+class ColumnarDataset(Dataset):
+    """Dataset that stores data by column, into typed arrays
+
+    Columns of int or float are stored into NumPy arrays, if NumPy is installed,
+    otherwise into arrays of the standard library; other columns are lists.
+    Operations that work by row (e.g. insert of a row) move data into rows,
+    like a classic Dataset.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Create ColumnarDataset object
+
+        :param args: rows of data
+        :param kwargs: headers and title of data
+        """
+        self._columns = None
+        self._row_data = []
+        super().__init__(**kwargs)
+        # zip truncates to the shortest row: check them before, like Dataset
+        if len({len(row) for row in args}) > 1:
+            raise InvalidDimensions("the row are not the same length")
+        self._set_columns([list(column) for column in zip(*args)])
+        self.headers = kwargs.get("headers")
+
+    @property
+    def _data(self):
+        """Rows of data; columns are moved into rows
+
+        :return: list
+        """
+        if self._columns is not None:
+            self._row_data = [Row(fields) for fields in self._iter_fields()]
+            self._columns = None
+        return self._row_data
+
+    @_data.setter
+    def _data(self, rows):
+        """Set rows of data
+
+        :param rows: list of Row objects
+        :return: None
+        """
+        self._columns = None
+        self._row_data = rows
+
+    @property
+    def columnar(self):
+        """Data is stored by column
+
+        :return: bool
+        """
+        return self._columns is not None
+
+    @property
+    def height(self):
+        """The number of rows
+
+        :return: int
+        """
+        if self._columns is None:
+            return super().height
+        return self._height
+
+    @property
+    def width(self):
+        """The number of columns
+
+        :return: int
+        """
+        if self._columns is None:
+            return super().width
+        if self._columns:
+            return len(self._columns)
+        return len(self.headers) if self.headers else 0
+
+    def _set_columns(self, columns):
+        """Store columns into typed containers
+
+        :param columns: list of columns
+        :return: None
+        """
+        self._columns = [_make_column(column) for column in columns]
+        self._height = len(self._columns[0]) if self._columns else 0
+
+    def _iter_fields(self, chunk=65536):
+        """Iterate over rows as list of fields
+
+        :param chunk: rows converted at a time
+        :return: generator
+        """
+        if self._columns is None:
+            yield from (row._row for row in self._row_data)
+            return
+        for start in range(0, self._height, chunk):
+            columns = [
+                _column_values(column[start : start + chunk])
+                for column in self._columns
+            ]
+            yield from (list(fields) for fields in zip(*columns))
+
+    def _fields_at(self, index):
+        """Fields of a row
+
+        :param index: row index
+        :return: list
+        """
+        if self._columns is None:
+            return self._row_data[index]._row
+        if not -self._height <= index < self._height:
+            raise IndexError("row index out of range")
+        return [_column_item(column, index) for column in self._columns]
+
+    def __iter__(self):
+        return (tuple(fields) for fields in self._iter_fields())
+
+    def __getitem__(self, key):
+        if self._columns is None:
+            return super().__getitem__(key)
+        if isinstance(key, str):
+            return _column_values(self._columns[_column_index(self.headers, key)])
+        if isinstance(key, slice):
+            indexes = range(*key.indices(self._height))
+            return [tuple(self._fields_at(index)) for index in indexes]
+        return tuple(self._fields_at(key))
+
+    def __delitem__(self, key):
+        if self._columns is None or not isinstance(key, str):
+            return super().__delitem__(key)
+        index = _column_index(self.headers, key)
+        del self.headers[index]
+        self._dynamic_columns.pop(index, None)
+        del self._columns[index]
+
+    def __str__(self):
+        if self._columns is None:
+            return super().__str__()
+        return str(self._as_dataset())
+
+    def _as_dataset(self):
+        """Temporary row Dataset with the same data
+
+        :return: Dataset
+        """
+        data = Dataset(title=self.title)
+        data._data = [Row(fields) for fields in self._iter_fields()]
+        data.headers = self.headers
+        data._formatters = self._formatters
+        return data
+
+    def _package(self, dicts=True):
+        if self._columns is None:
+            return super()._package(dicts)
+        return self._as_dataset()._package(dicts)
+
+    def get_col(self, index):
+        """Returns the column at the given index
+
+        :param index: column index
+        :return: list
+        """
+        if self._columns is None:
+            return super().get_col(index)
+        return _column_values(self._columns[index])
+
+    def insert_col(self, index, col=None, header=None):
+        """Inserts a column at the given index
+
+        :param index: column index
+        :param col: list of values, or function that takes a row
+        :param header: column name
+        :return: None
+        """
+        if self._columns is None or not self._height:
+            return super().insert_col(index, col, header=header)
+        if callable(col):
+            self._dynamic_columns[self.width] = col
+            col = [col(fields) for fields in self._iter_fields()]
+        col = self._clean_col(col)
+        if len(col) != self._height:
+            raise InvalidDimensions
+        if self.headers:
+            if not header:
+                raise HeadersNeeded()
+            self.headers.insert(index, header)
+        self._columns.insert(index, _make_column(col))
+
+    def sort(self, col, reverse=False):
+        if self._columns is None:
+            return super().sort(col, reverse=reverse)
+        return self._as_dataset().sort(col, reverse=reverse)
+
+    def subset(self, rows=None, cols=None):
+        if self._columns is None:
+            return super().subset(rows=rows, cols=cols)
+        return self._as_dataset().subset(rows=rows, cols=cols)
+
+    def get_array(self, index):
+        """Column container (array, NumPy array or list) without copy
+
+        :param index: column name or index
+        :return: array, ndarray or list
+        """
+        if self._columns is None:
+            raise DataObjectError("data is not stored by column")
+        return self._columns[_column_index(self.headers, index)]
+
+    def take(self, indexes):
+        """New ColumnarDataset with only the rows at indexes
+
+        :param indexes: iterable of row indexes
+        :return: ColumnarDataset
+        """
+        data = ColumnarDataset(title=self.title)
+        if self._columns is None:
+            rows = [self._fields_at(index) for index in indexes]
+            data._set_columns([list(column) for column in zip(*rows)])
+        else:
+            indexes = list(indexes)
+            data._set_columns(
+                [[_column_item(col, i) for i in indexes] for col in self._columns]
+            )
+        data.headers = self.headers
+        return data
+
+    def copy(self):
+        """Copy data and headers
+
+        :return: ColumnarDataset
+        """
+        if self._columns is None:
+            return columnar(self)
+        data = ColumnarDataset(title=self.title)
+        data._columns = [_column_copy(column) for column in self._columns]
+        data._height = self._height
+        data.headers = self.headers
+        return data
+
+
+class ChainedDataset(Dataset):
+    """Dataset that concatenates other Datasets, without copying their rows
+
+    Operations that change rows (e.g. insert of a row) copy data into rows,
+    like a classic Dataset.
+    """
+
+    def __init__(self, *datasets, **kwargs):
+        """Create ChainedDataset object
+
+        :param datasets: Dataset objects with the same width
+        :param kwargs: headers and title of data; headers of the first Dataset if not specified
+        """
+        self._datasets = None
+        self._row_data = []
+        super().__init__(**kwargs)
+        widths = {data.width for data in datasets if data.height}
+        if len(widths) > 1:
+            raise InvalidDimensions("the row are not the same length")
+        self._datasets = list(datasets)
+        self._offsets = list(accumulate(data.height for data in datasets))
+        if not kwargs.get("headers") and datasets and datasets[0].headers:
+            self.headers = datasets[0].headers
+
+    @property
+    def _data(self):
+        """Rows of data; Datasets are copied into rows
+
+        :return: list
+        """
+        if self._datasets is not None:
+            self._row_data = [Row(fields) for fields in self._iter_fields()]
+            self._datasets = None
+        return self._row_data
+
+    @_data.setter
+    def _data(self, rows):
+        """Set rows of data
+
+        :param rows: list of Row objects
+        :return: None
+        """
+        self._datasets = None
+        self._row_data = rows
+
+    @property
+    def height(self):
+        """The number of rows
+
+        :return: int
+        """
+        if self._datasets is None:
+            return super().height
+        return self._offsets[-1] if self._offsets else 0
+
+    @property
+    def width(self):
+        """The number of columns
+
+        :return: int
+        """
+        if self._datasets is None:
+            return super().width
+        for data in self._datasets:
+            if data.height:
+                return data.width
+        return len(self.headers) if self.headers else 0
+
+    def _iter_fields(self):
+        """Iterate over rows as list of fields
+
+        :return: generator
+        """
+        if self._datasets is None:
+            return (row._row for row in self._row_data)
+        return chain_iterables(*(_iter_fields(data) for data in self._datasets))
+
+    def _fields_at(self, index):
+        """Fields of a row
+
+        :param index: row index
+        :return: list
+        """
+        if self._datasets is None:
+            return self._row_data[index]._row
+        height = self.height
+        if not -height <= index < height:
+            raise IndexError("row index out of range")
+        index %= height
+        # Find the Dataset of the row through bisection of offsets
+        position = bisect_right(self._offsets, index)
+        start = self._offsets[position - 1] if position else 0
+        return _fields_at(self._datasets[position], index - start)
+
+    def __iter__(self):
+        return (tuple(fields) for fields in self._iter_fields())
+
+    def __getitem__(self, key):
+        if self._datasets is None:
+            return super().__getitem__(key)
+        if isinstance(key, str):
+            return self.get_col(_column_index(self.headers, key))
+        if isinstance(key, slice):
+            indexes = range(*key.indices(self.height))
+            return [tuple(self._fields_at(index)) for index in indexes]
+        return tuple(self._fields_at(key))
+
+    def __str__(self):
+        if self._datasets is None:
+            return super().__str__()
+        return str(self._as_dataset())
+
+    def _as_dataset(self):
+        """Temporary row Dataset with the same data
+
+        :return: Dataset
+        """
+        data = Dataset(title=self.title)
+        data._data = self._rows()
+        data.headers = self.headers
+        data._formatters = self._formatters
+        return data
+
+    def _rows(self):
+        """Row objects of data, shared with the Datasets when possible
+
+        :return: list
+        """
+        rows = []
+        for data in self._datasets:
+            if isinstance(data, (ColumnarDataset, ChainedDataset)):
+                rows.extend(Row(fields) for fields in _iter_fields(data))
+            else:
+                rows.extend(data._data)
+        return rows
+
+    def _package(self, dicts=True):
+        if self._datasets is None:
+            return super()._package(dicts)
+        return self._as_dataset()._package(dicts)
+
+    def get_col(self, index):
+        """Returns the column at the given index
+
+        :param index: column index
+        :return: list
+        """
+        if self._datasets is None:
+            return super().get_col(index)
+        return [value for data in self._datasets for value in data.get_col(index)]
+
+    def sort(self, col, reverse=False):
+        if self._datasets is None:
+            return super().sort(col, reverse=reverse)
+        return self._as_dataset().sort(col, reverse=reverse)
+
+    def subset(self, rows=None, cols=None):
+        if self._datasets is None:
+            return super().subset(rows=rows, cols=cols)
+        return self._as_dataset().subset(rows=rows, cols=cols)
+
+
+class DatasetView(ChainedDataset):
+    """Dataset of a range of rows of other Dataset, without copying them
+
+    Changes of the other Dataset are visible into the view. Operations that
+    change rows (e.g. insert of a row) copy data into rows, like a classic Dataset.
+    """
+
+    def __init__(self, data, start=0, stop=None, **kwargs):
+        """Create DatasetView object
+
+        :param data: Dataset object
+        :param start: index of first row
+        :param stop: index after last row; last row of data if not specified
+        :param kwargs: headers and title of data; headers of data if not specified
+        """
+        super().__init__(data, **kwargs)
+        self._start, self._stop, _ = slice(start, stop).indices(data.height)
+        self._stop = max(self._start, self._stop)
+
+    @property
+    def height(self):
+        """The number of rows
+
+        :return: int
+        """
+        if self._datasets is None:
+            return super().height
+        return self._stop - self._start
+
+    def _iter_fields(self):
+        """Iterate over rows as list of fields
+
+        :return: generator
+        """
+        if self._datasets is None:
+            return super()._iter_fields()
+        data = self._datasets[0]
+        return (_fields_at(data, index) for index in range(self._start, self._stop))
+
+    def _fields_at(self, index):
+        """Fields of a row
+
+        :param index: row index
+        :return: list
+        """
+        if self._datasets is None:
+            return super()._fields_at(index)
+        height = self.height
+        if not -height <= index < height:
+            raise IndexError("row index out of range")
+        return _fields_at(self._datasets[0], self._start + index % height)
+
+    def _rows(self):
+        """Row objects of data, shared with the Dataset when possible
+
+        :return: list
+        """
+        data = self._datasets[0]
+        if isinstance(data, (ColumnarDataset, ChainedDataset)):
+            return [Row(fields) for fields in self._iter_fields()]
+        return data._data[self._start : self._stop]
+
+    def get_col(self, index):
+        """Returns the column at the given index
+
+        :param index: column index
+        :return: list
+        """
+        if self._datasets is None:
+            return super().get_col(index)
+        return [fields[index] for fields in self._iter_fields()]
+
+    def copy(self):
+        """Copy rows and headers into a new Dataset
+
+        :return: Dataset
+        """
+        data = Dataset(title=self.title)
+        data._data = [Row(fields) for fields in self._iter_fields()]
+        data.headers = self.headers
+        return data
+
+
+class Statistics:
+    """Streaming statistics of numbers, updated chunk by chunk
+
+    Count, null count, mean and variance (merged per chunk, as Welford and Chan),
+    min, max and approximate percentiles (t-digest); Statistics of
+    partitions can be merged together.
+    """
+
+    def __init__(self, compression=100):
+        """Create Statistics object
+
+        :param compression: accuracy of percentiles (greater keeps more centroids)
+        """
+        self.compression = compression
+        self.count = 0
+        self.nulls = 0
+        self.mean = 0.0
+        self.min = None
+        self.max = None
+        self._m2 = 0.0
+        self._centroids = []
+        self._buffer = []
+
+    def __repr__(self):
+        """Representation of Statistics object
+
+        :return: string
+        """
+        return f"<Statistics object, count={self.count}, nulls={self.nulls}>"
+
+    @property
+    def variance(self):
+        """Population variance
+
+        :return: float
+        """
+        return self._m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self):
+        """Population standard deviation
+
+        :return: float
+        """
+        return math.sqrt(self.variance)
+
+    def update(self, values):
+        """Add values; None values are counted as nulls
+
+        :param values: iterable of int or float (also NumPy array)
+        :return: None
+        """
+        if numpy is not None and isinstance(values, numpy.ndarray):
+            if not len(values):
+                return
+            numbers = values.tolist()
+            mean = values.mean().item()
+            m2 = ((values - mean) ** 2).sum().item()
+            minimum, maximum = values.min().item(), values.max().item()
+        else:
+            numbers = []
+            for value in values:
+                if value is None:
+                    self.nulls += 1
+                elif isinstance(value, (int, float)):
+                    numbers.append(value)
+                else:
+                    raise DataObjectError("the column contains only int or float")
+            if not numbers:
+                return
+            mean = sum(numbers) / len(numbers)
+            m2 = sum((number - mean) ** 2 for number in numbers)
+            minimum, maximum = min(numbers), max(numbers)
+        self._combine(len(numbers), mean, m2, minimum, maximum)
+        self._buffer.extend(numbers)
+        if len(self._buffer) > 50 * self.compression:
+            self._compress()
+
+    def add(self, data, column):
+        """Add values of a column
+
+        :param data: Dataset object, or iterable of Dataset objects (chunks)
+        :param column: column name or index
+        :return: None
+        """
+        datasets = [data] if isinstance(data, Dataset) else data
+        for chunk in datasets:
+            values = None
+            if isinstance(chunk, ColumnarDataset) and chunk.columnar:
+                values = _numeric_array(chunk, _column_index(chunk.headers, column))
+            if values is None:
+                values = _select_column(chunk, column)
+            self.update(values)
+
+    def merge(self, other):
+        """Merge Statistics of other values
+
+        :param other: Statistics object
+        :return: None
+        """
+        self.nulls += other.nulls
+        if not other.count:
+            return
+        self._combine(other.count, other.mean, other._m2, other.min, other.max)
+        self._centroids.extend(other._centroids)
+        self._buffer.extend(other._buffer)
+        self._compress(force=True)
+
+    def percentile(self, percent):
+        """Approximate percentile
+
+        :param percent: percent between 0 and 100
+        :return: float
+        """
+        if not self.count:
+            raise DataObjectError("there are no values")
+        if not 0 <= percent <= 100:
+            raise DataObjectError("percent must be between 0 and 100")
+        self._compress()
+        rank = percent / 100 * self.count
+        # Interpolate between centers of centroids, or min and max at edges
+        previous_center, previous_mean = 0.0, self.min
+        cumulative = 0
+        for mean, weight in self._centroids:
+            center = cumulative + weight / 2
+            if rank < center:
+                fraction = (rank - previous_center) / (center - previous_center)
+                return previous_mean + fraction * (mean - previous_mean)
+            previous_center, previous_mean = center, mean
+            cumulative += weight
+        if self.count == previous_center:
+            return float(self.max)
+        fraction = (rank - previous_center) / (self.count - previous_center)
+        return previous_mean + fraction * (self.max - previous_mean)
+
+    def summary(self, *percents):
+        """All statistics
+
+        :param percents: percents of percentiles; 50, 90, 95 and 99 if not specified
+        :return: dict
+        """
+        result = {
+            "count": self.count,
+            "nulls": self.nulls,
+            "mean": self.mean,
+            "std": self.std,
+            "min": self.min,
+            "max": self.max,
+        }
+        if self.count:
+            for percent in percents or (50, 90, 95, 99):
+                result[f"p{percent}"] = self.percentile(percent)
+        return result
+
+    def _combine(self, count, mean, m2, minimum, maximum):
+        """Combine moments of other values (Chan parallel algorithm)
+
+        :param count: number of values
+        :param mean: mean of values
+        :param m2: sum of squared differences from mean
+        :param minimum: minimum of values
+        :param maximum: maximum of values
+        :return: None
+        """
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self._m2 += m2 + delta**2 * self.count * count / total
+        self.count = total
+        self.min = minimum if self.min is None else min(self.min, minimum)
+        self.max = maximum if self.max is None else max(self.max, maximum)
+
+    def _compress(self, force=False):
+        """Merge buffered values and centroids into the t-digest
+
+        :param force: merge centroids also without buffered values
+        :return: None
+        """
+        if not self._buffer and not force:
+            return
+        points = self._centroids + [[value, 1] for value in self._buffer]
+        self._buffer = []
+        points.sort(key=operator.itemgetter(0))
+        total = sum(weight for _, weight in points)
+        centroids, cumulative = [], 0
+        for mean, weight in points:
+            if centroids:
+                last = centroids[-1]
+                merged = last[1] + weight
+                # Centroids are smaller at the tails
+                quantile = (cumulative + merged / 2) / total
+                if merged <= 4 * total * quantile * (1 - quantile) / self.compression:
+                    last[0] += (mean - last[0]) * weight / merged
+                    last[1] = merged
+                    continue
+                cumulative += last[1]
+            centroids.append([mean, weight])
+        self._centroids = centroids
+
+
+class HyperLogLog:
+    """Approximate distinct counter (HyperLogLog) into 2 ** precision bytes
+
+    The relative error is about 1.04 / sqrt(2 ** precision). Values are
+    hashed with BLAKE2, so counters of other chunks and processes can be merged.
+    """
+
+    def __init__(self, precision=12):
+        """Create HyperLogLog object
+
+        :param precision: bits of the index of registers, between 4 and 18
+        """
+        if not 4 <= precision <= 18:
+            raise DataObjectError("precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def __repr__(self):
+        """Representation of HyperLogLog object
+
+        :return: string
+        """
+        return f"<HyperLogLog object, precision={self.precision}>"
+
+    def __len__(self):
+        """Estimated number of distinct values
+
+        :return: int
+        """
+        return self.estimate()
+
+    def update(self, values):
+        """Add values
+
+        :param values: iterable of values
+        :return: None
+        """
+        registers, precision = self.registers, self.precision
+        bits = 64 - precision
+        mask = (1 << bits) - 1
+        for value in values:
+            if isinstance(value, float) and value.is_integer():
+                # Equal numbers are the same value
+                value = int(value)
+            digest = hashlib.blake2b(repr(value).encode(), digest_size=8).digest()
+            hashed = int.from_bytes(digest, "big")
+            index = hashed >> bits
+            rank = bits - (hashed & mask).bit_length() + 1
+            if rank > registers[index]:
+                registers[index] = rank
+
+    def add(self, data, column):
+        """Add values of a column
+
+        :param data: Dataset object, or iterable of Dataset objects (chunks)
+        :param column: column name or index
+        :return: None
+        """
+        datasets = [data] if isinstance(data, Dataset) else data
+        for chunk in datasets:
+            self.update(_select_column(chunk, column))
+
+    def merge(self, other):
+        """Merge the counter of other values
+
+        :param other: HyperLogLog object with the same precision
+        :return: None
+        """
+        if other.precision != self.precision:
+            raise DataObjectError("counters have not the same precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def estimate(self):
+        """Estimated number of distinct values
+
+        :return: int
+        """
+        size = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size**2 / sum(2.0**-rank for rank in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * size and zeros:
+            # Linear counting for small cardinalities
+            estimate = size * math.log(size / zeros)
+        return round(estimate)
+
+
+class GroupBy:
+    """Hash aggregation of the rows of Datasets, grouped by columns"""
+
+    def __init__(self, data, *columns):
+        """Create GroupBy object
+
+        :param data: Dataset object, or iterable of Dataset objects (chunks)
+        :param columns: columns name or index of group keys
+        """
+        if not columns:
+            raise DataObjectError("group by one or more columns")
+        self.data = data
+        self.columns = columns
+
+    def __repr__(self):
+        """Representation of GroupBy object
+
+        :return: string
+        """
+        return f"<GroupBy object, columns={self.columns}>"
+
+    def agg(self, aggregates=None):
+        """Aggregate the rows of every group, in a single pass
+
+        :param aggregates: dict {column: reducer or list of reducers}; a reducer is
+            the name of one of REDUCERS or a function that takes the result so far
+            and the next value, and returns the new result
+        :return: Dataset
+        """
+        reducers = []
+        for column, functions in (aggregates or {}).items():
+            if callable(functions) or isinstance(functions, str):
+                functions = [functions]
+            for function in functions:
+                if callable(function):
+                    first, step, result = None, function, None
+                    name = function.__name__
+                elif function in REDUCERS:
+                    first, step, result = REDUCERS[function]
+                    name = function
+                else:
+                    raise DataObjectError(f"{function} is not one of {tuple(REDUCERS)}")
+                reducers.append((column, name, first, step, result))
+        datasets = [self.data] if isinstance(self.data, Dataset) else self.data
+        groups, headers = {}, None
+        for data in datasets:
+            if headers is None:
+                # Resolve columns with headers of the first chunk
+                headers = data.headers
+                keys = [_column_index(headers, column) for column in self.columns]
+                indexes = [_column_index(headers, column) for column, *_ in reducers]
+                firsts = [first for _, _, first, _, _ in reducers]
+                steps = list(enumerate(step for _, _, _, step, _ in reducers))
+                single = keys[0] if len(keys) == 1 else None
+            for fields in _iter_fields(data):
+                key = (
+                    fields[single]
+                    if single is not None
+                    else tuple(fields[index] for index in keys)
+                )
+                states = groups.get(key)
+                if states is None:
+                    groups[key] = [
+                        fields[index] if first is None else first(fields[index])
+                        for index, first in zip(indexes, firsts)
+                    ]
+                else:
+                    for position, step in steps:
+                        states[position] = step(
+                            states[position], fields[indexes[position]]
+                        )
+        new_data = Dataset()
+        rows = []
+        for key, states in groups.items():
+            row = [key] if len(self.columns) == 1 else list(key)
+            for (_, _, _, _, result), state in zip(reducers, states):
+                row.append(state if result is None else result(state))
+            rows.append(Row(row))
+        new_data._data = rows
+        names = [_column_name(headers, column) for column in self.columns]
+        names.extend(
+            f"{_column_name(headers, column)}_{name}" for column, name, *_ in reducers
+        )
+        if headers or all(isinstance(name, str) for name in self.columns):
+            new_data.headers = names
+        return new_data
+
+
+class _Descending:
+    """Value of a sort key compared in reverse order"""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+
 # endregion
 
 
 # region Functions
+def _column_name(headers, column):
+    """Name of a column
+
+    :param headers: list of headers, or None
+    :param column: column name or index
+    :return: str
+    """
+    if isinstance(column, int) and headers:
+        return headers[column]
+    return str(column)
+
+
+def _sort_key(indexes, reverse):
+    """Key of rows sorted by columns
+
+    :param indexes: list of column indexes
+    :param reverse: bool, or list of bool (one for each column)
+    :return: tuple (key function, reverse)
+    """
+    if isinstance(reverse, bool):
+        return _key_getter(indexes), reverse
+    if len(reverse) != len(indexes):
+        raise DataObjectError("reverse needs a value for each column")
+    if len(set(reverse)) == 1:
+        return _key_getter(indexes), reverse[0]
+
+    # Mixed order: descending values are compared in reverse
+    def key(fields):
+        return tuple(
+            _Descending(fields[index]) if desc else fields[index]
+            for index, desc in zip(indexes, reverse)
+        )
+
+    return key, False
+
+
+def _sort_rows(rows, indexes, reverse):
+    """Sort a list of rows by columns, in place
+
+    :param rows: list of rows
+    :param indexes: list of column indexes
+    :param reverse: bool, or list of bool (one for each column)
+    :return: None
+    """
+    if isinstance(reverse, bool):
+        reverse = [reverse] * len(indexes)
+    # Sort is stable: sort by the last column first
+    for index, desc in reversed(list(zip(indexes, reverse))):
+        rows.sort(key=operator.itemgetter(index), reverse=desc)
+
+
+def _write_run(rows, block=1024):
+    """Write sorted rows into a temporary file
+
+    :param rows: list of rows
+    :param block: number of rows pickled together
+    :return: file object
+    """
+    run = tempfile.TemporaryFile()
+    for index in range(0, len(rows), block):
+        pickle.dump(rows[index : index + block], run, pickle.HIGHEST_PROTOCOL)
+    run.seek(0)
+    return run
+
+
+def _read_run(run):
+    """Read sorted rows from a temporary file, then close it
+
+    :param run: file object
+    :return: generator
+    """
+    with run:
+        while True:
+            try:
+                yield from pickle.load(run)
+            except EOFError:
+                return
+
+
 def _select_column(data: Dataset, column):
     """Select Dataset column
 
@@ -213,6 +1582,153 @@ def _select_column(data: Dataset, column):
         return data[column]
 
 
+def _column_index(headers, column):
+    """Resolve the position of a Dataset column
+
+    :param headers: headers of Dataset object
+    :param column: column name or index
+    :return: int
+    """
+    if isinstance(column, int):
+        return column
+    if headers is None:
+        raise HeadersNeeded()
+    if column not in headers:
+        raise KeyError(column)
+    return headers.index(column)
+
+
+def _make_column(values):
+    """Store a column into the most compact container
+
+    :param values: list of values
+    :return: array, ndarray or list
+    """
+    kinds = {type(value) for value in values}
+    if kinds == {int}:
+        typecode, dtype = "q", "int64"
+    elif kinds == {float}:
+        typecode, dtype = "d", "float64"
+    else:
+        return list(values)
+    try:
+        if numpy is not None:
+            return numpy.array(values, dtype=dtype)
+        return array(typecode, values)
+    except OverflowError:
+        return list(values)
+
+
+def _column_values(column):
+    """Values of a column container as list
+
+    :param column: array, ndarray or list
+    :return: list
+    """
+    if isinstance(column, list):
+        return list(column)
+    return column.tolist()
+
+
+def _column_item(column, index):
+    """Value of a column container
+
+    :param column: array, ndarray or list
+    :param index: row index
+    :return: Any
+    """
+    if numpy is not None and isinstance(column, numpy.ndarray):
+        return column.item(index)
+    return column[index]
+
+
+def _column_copy(column):
+    """Copy a column container
+
+    :param column: array, ndarray or list
+    :return: array, ndarray or list
+    """
+    if isinstance(column, array):
+        return array(column.typecode, column)
+    return column.copy()
+
+
+def _iter_fields(data: Dataset):
+    """Iterate over the rows of a Dataset as list of fields
+
+    :param data: Dataset object
+    :return: generator
+    """
+    if isinstance(data, (ColumnarDataset, ChainedDataset)):
+        return data._iter_fields()
+    return (row._row for row in data._data)
+
+
+def _fields_at(data: Dataset, index):
+    """Fields of a Dataset row
+
+    :param data: Dataset object
+    :param index: row index
+    :return: list
+    """
+    if isinstance(data, (ColumnarDataset, ChainedDataset)):
+        return data._fields_at(index)
+    return data._data[index]._row
+
+
+def columnar(data: Dataset):
+    """Store a Dataset by column
+
+    :param data: Dataset object
+    :return: ColumnarDataset
+    """
+    if isinstance(data, ColumnarDataset) and data.columnar:
+        return data.copy()
+    new_data = ColumnarDataset(title=data.title)
+    new_data._set_columns([list(column) for column in zip(*_iter_fields(data))])
+    new_data.headers = data.headers
+    return new_data
+
+
+def _numeric_array(data: Dataset, column):
+    """NumPy array of a column of integers or floats, if NumPy is installed
+
+    :param data: Dataset object
+    :param column: column index
+    :return: ndarray or None
+    """
+    if numpy is None:
+        return None
+    if isinstance(data, ColumnarDataset) and data.columnar:
+        values = data._columns[column]
+        if isinstance(values, list):
+            return None
+        return numpy.asarray(values)
+    values = data.get_col(column)
+    kinds = {type(value) for value in values}
+    if not kinds or not kinds <= {int, float}:
+        return None
+    values = numpy.array(values)
+    return values if values.dtype.kind in "iuf" else None
+
+
+def _column_count(column, value):
+    """Count value into a column container
+
+    :param column: array, ndarray or list
+    :param value: Any value
+    :return: int
+    """
+    if numpy is not None and isinstance(column, numpy.ndarray):
+        # Numeric column: strings and None are never equal
+        if isinstance(value, (str, bytes, type(None))):
+            return 0
+        if isinstance(value, (int, float)):
+            return int(numpy.count_nonzero(column == value))
+        return column.tolist().count(value)
+    return column.count(value)
+
+
 def average(data: Dataset, column):
     """
     Average of list of integers or floats
@@ -221,6 +1737,11 @@ def average(data: Dataset, column):
     :param column: column name or index
     :return: float
     """
+    # Calculate average through NumPy, on stored columns
+    if isinstance(data, ColumnarDataset) and data.columnar:
+        values = _numeric_array(data, _column_index(data.headers, column))
+        if values is not None and len(values):
+            return float(values.mean())
     # Select column
     data = _select_column(data, column)
     # Check if all item is integer or float
@@ -230,17 +1751,96 @@ def average(data: Dataset, column):
     return float(sum(data) / len(data))
 
 
-def most_common(data: Dataset, column):
+def statistics(data, column, compression=100):
+    """
+    Streaming statistics of a column of integers or floats: count, nulls,
+    mean, variance, std, min, max and approximate percentiles
+
+    :param data: Dataset object, or iterable of Dataset objects (chunks)
+    :param column: column name or index
+    :param compression: accuracy of percentiles (greater keeps more centroids)
+    :return: Statistics
+    """
+    stats = Statistics(compression)
+    stats.add(data, column)
+    return stats
+
+
+def approx_distinct(data, column, precision=12):
+    """
+    Approximate number of distinct values of a column, through HyperLogLog
+    into 2 ** precision bytes; the relative error is about 1.04 / sqrt(2 ** precision)
+
+    :param data: Dataset object, or iterable of Dataset objects (chunks)
+    :param column: column name or index
+    :param precision: bits of the index of registers, between 4 and 18
+    :return: int
+    """
+    counter_ = HyperLogLog(precision)
+    counter_.add(data, column)
+    return counter_.estimate()
+
+
+def most_common(data: Dataset, column, n=None):
     """
     The most common element in a column
 
     :param data: Dataset object
     :param column: column name or index
-    :return: Any
+    :param n: number of most common elements with their count
+    :return: Any, or list of tuple (element, count) if n is specified
     """
-    # Select column
-    data = _select_column(data, column)
-    return max(data, key=data.count)
+    values = _select_column(data, column)
+    try:
+        # Count all elements in a single pass
+        counts = Counter(values).most_common(n if n is not None else 1)
+    except TypeError:
+        # Unhashable elements (e.g. lists): count each distinct element
+        distinct = []
+        for value in values:
+            if value not in distinct:
+                distinct.append(value)
+        counts = sorted(
+            ((value, values.count(value)) for value in distinct),
+            key=operator.itemgetter(1),
+            reverse=True,
+        )[: n if n is not None else 1]
+    if n is not None:
+        return counts
+    if not counts:
+        raise ValueError("most_common() arg is an empty sequence")
+    return counts[0][0]
+
+
+def heavy_hitters(data, column, k=100):
+    """
+    Approximate most common elements of a column, counting at most k elements
+    at a time (Misra-Gries): every element that occurs more than n / (k + 1)
+    times in n rows is returned; counts are lower than the exact ones by
+    n / (k + 1) at most
+
+    :param data: Dataset object, or iterable of Dataset objects (chunks)
+    :param column: column name or index
+    :param k: maximum number of counted elements
+    :return: list of tuple (element, count), most common first
+    """
+    if k < 1:
+        raise DataObjectError("k must be greater than zero")
+    datasets = [data] if isinstance(data, Dataset) else data
+    counts = {}
+    for chunk in datasets:
+        for value in _select_column(chunk, column):
+            if value in counts:
+                counts[value] += 1
+            elif len(counts) < k:
+                counts[value] = 1
+            else:
+                # Decrement all counters; drop the counters at zero
+                for key in list(counts):
+                    counts[key] -= 1
+                    if not counts[key]:
+                        del counts[key]
+    return Counter(counts).most_common()
 
 
 def percentage(data: Dataset, filter_):
@@ -251,12 +1851,310 @@ def percentage(data: Dataset, filter_):
     :param filter_: equality filter
     :return: float
     """
-    # Filtering data...
-    data_filtered = [item for row in data for item in row if filter_ == item]
-    quotient = len(data_filtered) / len(data)
+    # Count filter into rows or columns...
+    if isinstance(data, ColumnarDataset) and data.columnar:
+        count = sum(_column_count(column, filter_) for column in data._columns)
+    else:
+        count = sum(row._row.count(filter_) for row in data._data)
+    quotient = count / len(data)
     return quotient * 100
 
 
+def percentages(data: Dataset, filters, column=None):
+    """
+    Calculating the percentage according to many filters, in a single pass
+    over the data; the same results of percentage for each filter
+
+    :param data: Dataset object
+    :param filters: equality filters
+    :param column: column name or index; all columns if not specified
+    :return: dict
+    """
+    filters = list(filters)
+    # Containers of values: a column, the stored columns or the rows
+    columnar = isinstance(data, ColumnarDataset) and data.columnar
+    if column is not None:
+        if columnar:
+            containers = [data._columns[_column_index(data.headers, column)]]
+        else:
+            containers = [_select_column(data, column)]
+    elif columnar:
+        containers = data._columns
+    else:
+        containers = list(_iter_fields(data))
+    try:
+        counts = Counter(
+            chain_iterables.from_iterable(
+                values.tolist()
+                if numpy is not None and isinstance(values, numpy.ndarray)
+                else values
+                for values in containers
+            )
+        )
+        found = {filter_: counts[filter_] for filter_ in filters}
+    except TypeError:
+        # Unhashable values: count each filter
+        found = {
+            filter_: sum(_column_count(values, filter_) for values in containers)
+            for filter_ in filters
+        }
+    height = data.height
+    return {filter_: count / height * 100 for filter_, count in found.items()}
+
+
+def describe(data: Dataset, column, *aggregates):
+    """
+    Aggregates of a column of integers or floats:
+    count, sum, mean, min, max and std (population standard deviation)
+
+    :param data: Dataset object
+    :param column: column name or index
+    :param aggregates: names of aggregates; all if not specified
+    :return: dict
+    """
+    aggregates = aggregates or AGGREGATES
+    for name in aggregates:
+        if name not in AGGREGATES:
+            raise DataObjectError(f"{name} is not one of {AGGREGATES}")
+    values = _numeric_array(data, _column_index(data.headers, column))
+    if values is None:
+        values = _select_column(data, column)
+        # Check if all item is integer or float
+        if not all(isinstance(item, (int, float)) for item in values):
+            raise DataObjectError("the column contains only int or float")
+    if not len(values):
+        raise DataObjectError("the column is empty")
+    if isinstance(values, list):
+        mean = sum(values) / len(values)
+        functions = {
+            "sum": sum,
+            "mean": lambda _: mean,
+            "min": min,
+            "max": max,
+            "std": lambda v: math.sqrt(sum((x - mean) ** 2 for x in v) / len(v)),
+        }
+    else:
+        # Vectorized aggregates through NumPy
+        functions = {
+            "sum": lambda v: v.sum().item(),
+            "mean": lambda v: v.mean().item(),
+            "min": lambda v: v.min().item(),
+            "max": lambda v: v.max().item(),
+            "std": lambda v: v.std().item(),
+        }
+    functions["count"] = len
+    return {name: functions[name](values) for name in aggregates}
+
+
+def group_by(data, *columns):
+    """
+    Group rows by columns, to aggregate them through agg method;
+    data can be an iterable of Dataset (chunks), aggregated one at a time
+
+    :param data: Dataset object, or iterable of Dataset objects
+    :param columns: columns name or index of group keys
+    :return: GroupBy
+    """
+    return GroupBy(data, *columns)
+
+
+def _key_getter(indexes):
+    """Function that gets the key of a row
+
+    :param indexes: list of column indexes
+    :return: function
+    """
+    # A tuple of fields for more indexes
+    return operator.itemgetter(*indexes)
+
+
+def _other_columns(keys):
+    """Indexes of the right columns that are not keys (not repeated by a join)
+
+    :param keys: tuple (left column indexes, right column indexes, right width)
+    :return: list
+    """
+    _, right_indexes, right_width = keys
+    return [index for index in range(right_width) if index not in right_indexes]
+
+
+def _join_table(right, keys, how="inner"):
+    """Hash table of right rows of a join
+
+    :param right: iterable of list of fields
+    :param keys: tuple (left column indexes, right column indexes, right width)
+    :param how: one of JOINS
+    :return: set of keys (semi and anti), or dict {key: list of other fields}
+    """
+    right_key = _key_getter(keys[1])
+    if how in ("semi", "anti"):
+        # Only keys of right rows are needed
+        return {right_key(fields) for fields in right}
+    others = _other_columns(keys)
+    table = {}
+    for fields in right:
+        table.setdefault(right_key(fields), []).append(
+            [fields[index] for index in others]
+        )
+    return table
+
+
+def _probe(left, table, keys, how="inner"):
+    """Join left rows with the hash table of right rows
+
+    :param left: iterable of list of fields
+    :param table: hash table of _join_table
+    :param keys: tuple (left column indexes, right column indexes, right width)
+    :param how: one of JOINS
+    :return: generator
+    """
+    left_key = _key_getter(keys[0])
+    if how in ("semi", "anti"):
+        for fields in left:
+            if (left_key(fields) in table) == (how == "semi"):
+                yield list(fields)
+        return
+    missing = [[None] * len(_other_columns(keys))] if how == "left" else ()
+    for fields in left:
+        for match in table.get(left_key(fields), missing):
+            yield list(fields) + match
+
+
+def _hash_join(left, left_height, right, right_height, keys, how="inner"):
+    """Join rows of fields through a hash table of keys
+
+    :param left: iterable of list of fields
+    :param left_height: number of left rows
+    :param right: iterable of list of fields
+    :param right_height: number of right rows, or None if right rows are streamed
+    :param keys: tuple (left column indexes, right column indexes, right width)
+    :param how: one of JOINS
+    :return: generator
+    """
+    if right_height is not None and left_height >= right_height:
+        # Hash right rows, probe with left rows
+        yield from _probe(left, _join_table(right, keys, how), keys, how)
+        return
+    # Hash left rows, probe with right rows, then return rows in left order
+    left_key, right_key = _key_getter(keys[0]), _key_getter(keys[1])
+    if how in ("semi", "anti"):
+        rows, table, matched = [], set(), set()
+        for fields in left:
+            key = left_key(fields)
+            rows.append((list(fields), key))
+            table.add(key)
+        for fields in right:
+            key = right_key(fields)
+            if key in table:
+                matched.add(key)
+                # All left keys are matched: other right rows are useless
+                if len(matched) == len(table):
+                    break
+        for fields, key in rows:
+            if (key in matched) == (how == "semi"):
+                yield fields
+        return
+    others = _other_columns(keys)
+    rows, table = [], {}
+    for position, fields in enumerate(left):
+        rows.append((list(fields), []))
+        table.setdefault(left_key(fields), []).append(position)
+    for fields in right:
+        for position in table.get(right_key(fields), ()):
+            rows[position][1].append([fields[index] for index in others])
+    missing = [[None] * len(others)] if how == "left" else []
+    for fields, matches in rows:
+        for match in matches or missing:
+            yield fields + match
+
+
+def _join_plan(left_headers, right, on, how):
+    """Resolve columns and headers of a join
+
+    :param left_headers: headers of left rows
+    :param right: right Dataset object
+    :param on: column name or index, or list of them
+    :param how: one of JOINS
+    :return: tuple (keys, headers)
+    """
+    if how not in JOINS:
+        raise DataObjectError(f"{how} is not one of {JOINS}")
+    on = list(on) if isinstance(on, (list, tuple)) else [on]
+    left_indexes = [_column_index(left_headers, column) for column in on]
+    right_indexes = [_column_index(right.headers, column) for column in on]
+    headers = left_headers
+    if how in ("inner", "left"):
+        # Headers only if both sides have them
+        headers = (
+            left_headers
+            and right.headers
+            and list(left_headers)
+            + [
+                header
+                for index, header in enumerate(right.headers or [])
+                if index not in right_indexes
+            ]
+        )
+    return (left_indexes, right_indexes, right.width), headers
+
+
+def _join_chunks(chunks, right, on, how):
+    """Join chunks with a Dataset, through a hash table of the Dataset
+
+    :param chunks: iterable of Dataset objects
+    :param right: Dataset object
+    :param on: column name or index, or list of them, of both Datasets
+    :param how: one of JOINS
+    :return: generator of Dataset
+    """
+    table = None
+    for chunk in chunks:
+        if table is None:
+            keys, headers = _join_plan(chunk.headers, right, on, how)
+            table = _join_table(_iter_fields(right), keys, how)
+        new_data = Dataset()
+        new_data._data = [
+            Row(fields) for fields in _probe(_iter_fields(chunk), table, keys, how)
+        ]
+        if headers:
+            new_data.headers = headers
+        yield new_data
+
+
+def join(left, right: Dataset, on, how="inner"):
+    """
+    Join two Dataset through a hash table on the smaller one:
+    inner, left (None for the missing fields), semi or anti (left rows with or without a match)
+
+    :param left: Dataset object, or iterable of Dataset objects (chunks) streamed
+        through a hash table of right
+    :param right: Dataset object
+    :param on: column name or index, or list of them, of both Datasets
+    :param how: one of JOINS
+    :return: Dataset, or generator of Dataset for each chunk
+    """
+    if not isinstance(left, Dataset):
+        if how not in JOINS:
+            raise DataObjectError(f"{how} is not one of {JOINS}")
+        return _join_chunks(left, right, on, how)
+    keys, headers = _join_plan(left.headers, right, on, how)
+    new_data = Dataset()
+    new_data._data = [
+        Row(fields)
+        for fields in _hash_join(
+            _iter_fields(left),
+            left.height,
+            _iter_fields(right),
+            right.height,
+            keys,
+            how,
+        )
+    ]
+    if headers:
+        new_data.headers = headers
+    return new_data
+
+
 def counter(data: Dataset, column):
     """
     Count all row value
@@ -300,6 +2198,20 @@ def aggregate(*columns, fill_empty: bool = False, fill_value=None):
         raise DataObjectError("you can aggregate two or more columns")
 
 
+def _extend(data: Dataset, other: Dataset):
+    """Append all rows of other Dataset, checking the width once
+
+    :param data: Dataset object
+    :param other: Dataset object
+    :return: None
+    """
+    if not other.height:
+        return
+    if data.width and other.width != data.width:
+        raise InvalidDimensions("the row are not the same length")
+    data._data.extend(Row(fields) for fields in _iter_fields(other))
+
+
 def merge(*datasets):
     """
     Merge two or more dataset in only one
@@ -310,26 +2222,264 @@ def merge(*datasets):
     if len(datasets) >= 2:
         new_data = Dataset()
         # Check len of row
-        length_row = max([len(dataset[0]) for dataset in datasets])
+        length_row = max([data.width for data in datasets])
         for data in datasets:
-            if length_row != len(data[0]):
+            if length_row != data.width:
                 raise InvalidDimensions("the row are not the same length")
-            new_data.extend(data)
+            _extend(new_data, data)
         return new_data
     else:
         raise DataObjectError("you can merge two or more dataset object")
 
 
+def chain(*datasets):
+    """
+    Concatenate Datasets into a ChainedDataset, without copying their rows
+
+    :param datasets: Dataset object collection
+    :return: ChainedDataset
+    """
+    return ChainedDataset(*datasets)
+
+
 def chunks(data: Dataset, length):
     """
     Yield successive n-sized chunks from data
 
     :param data: Dataset object
     :param length: n-sized chunks
-    :return: generator
+    :return: generator of DatasetView, without copying rows
     """
     for idx in range(0, len(data), length):
-        yield data[idx : idx + length]
+        yield DatasetView(data, idx, idx + length)
+
+
+def external_sort(data, columns, reverse=False, buffer=100000):
+    """
+    Sort rows larger than memory: sorted runs of buffer rows are written into
+    temporary files and merged together
+
+    :param data: Dataset object, or iterable of Dataset objects (chunks)
+    :param columns: column name or index, or list of them
+    :param reverse: reversed order, or list of it for each column
+    :param buffer: maximum number of rows sorted into memory
+    :return: generator of rows (tuple)
+    """
+    columns = list(columns) if isinstance(columns, (list, tuple)) else [columns]
+    datasets = [data] if isinstance(data, Dataset) else data
+    runs, rows, key = [], [], None
+    for chunk in datasets:
+        if key is None:
+            indexes = [_column_index(chunk.headers, column) for column in columns]
+            key, desc = _sort_key(indexes, reverse)
+        # Only buffer rows at a time are copied into memory
+        for fields in _iter_fields(chunk):
+            rows.append(tuple(fields))
+            if len(rows) == buffer:
+                _sort_rows(rows, indexes, reverse)
+                runs.append(_write_run(rows))
+                rows = []
+    if key is None:
+        return
+    _sort_rows(rows, indexes, reverse)
+    if not runs:
+        yield from rows
+        return
+    runs.append(_write_run(rows))
+    del rows
+    yield from heapq.merge(*map(_read_run, runs), key=key, reverse=desc)
+
+
+def _top_indexes(values, k, reverse=False):
+    """Indexes of the k smallest (or greatest) values of a NumPy array, in order
+
+    :param values: ndarray
+    :param k: number of indexes
+    :param reverse: k greatest values
+    :return: list
+    """
+    kth = len(values) - k if reverse else k - 1
+    threshold = numpy.partition(values, kth)[kth]
+    better = values > threshold if reverse else values < threshold
+    indexes = numpy.flatnonzero(better).tolist()
+    # Values equal to threshold: the first rows, as a stable sort
+    indexes.extend(numpy.flatnonzero(values == threshold)[: k - len(indexes)].tolist())
+    indexes.sort()
+    keys = values[indexes].tolist()
+    order = sorted(range(len(indexes)), key=keys.__getitem__, reverse=reverse)
+    return [indexes[position] for position in order]
+
+
+def top_k(data: Dataset, column, k, reverse=False):
+    """
+    First k rows of a Dataset sorted by a column, through a heap of k rows
+    instead of sorting all rows
+
+    :param data: Dataset object
+    :param column: column to sort
+    :param k: number of rows
+    :param reverse: reversed order (k greatest values)
+    :return: Dataset
+    """
+    index = _column_index(data.headers, column)
+    k = max(0, min(k, data.height))
+    values = None
+    if isinstance(data, ColumnarDataset) and 0 < k < data.height:
+        values = _numeric_array(data, index)
+    if values is not None:
+        # Partition the whole column through NumPy
+        indexes = _top_indexes(values, k, reverse)
+    else:
+        select = heapq.nlargest if reverse else heapq.nsmallest
+        rows = select(k, enumerate(_iter_fields(data)), key=lambda row: row[1][index])
+        indexes = [position for position, _ in rows]
+    if isinstance(data, ColumnarDataset):
+        return data.take(indexes)
+    new_data = Dataset(title=data.title)
+    new_data._data = [Row(list(_fields_at(data, position))) for position in indexes]
+    new_data.headers = data.headers
+    return new_data
+
+
+def _random_open(generator):
+    """Random float into the open interval (0, 1)
+
+    :param generator: Random object
+    :return: float
+    """
+    value = generator.random()
+    while not value:
+        value = generator.random()
+    return value
+
+
+def _reservoir(datasets, n, generator):
+    """Positions and fields of n random rows, through reservoir sampling
+    (algorithm L: the rows between two replacements are skipped)
+
+    :param datasets: iterable of Dataset objects
+    :param n: number of rows
+    :param generator: Random object
+    :return: list of tuple
+    """
+    reservoir = []
+    position = offset = 0
+    weight = 1.0
+    for data in datasets:
+        end = offset + data.height
+        while n and position < end:
+            fields = list(_fields_at(data, position - offset))
+            if len(reservoir) < n:
+                reservoir.append((position, fields))
+                position += 1
+                if len(reservoir) < n:
+                    continue
+            else:
+                reservoir[generator.randrange(n)] = (position, fields)
+                position += 1
+            weight *= math.exp(math.log(_random_open(generator)) / n)
+            position += math.floor(
+                math.log(_random_open(generator)) / math.log(1 - weight)
+            )
+        offset = end
+    return reservoir
+
+
+def _bernoulli(datasets, rate, generator):
+    """Positions and fields of rows, each one selected with a probability
+    (the rows between two selections are skipped)
+
+    :param datasets: iterable of Dataset objects
+    :param rate: probability of each row, between 0 and 1
+    :param generator: Random object
+    :return: list of tuple
+    """
+
+    def gap():
+        if rate >= 1:
+            return 0
+        if rate <= 0:
+            return math.inf
+        return math.floor(math.log(_random_open(generator)) / math.log(1 - rate))
+
+    rows = []
+    offset = 0
+    position = gap()
+    for data in datasets:
+        end = offset + data.height
+        while position < end:
+            rows.append((position, list(_fields_at(data, position - offset))))
+            position += 1 + gap()
+        offset = end
+    return rows
+
+
+def _stratified(datasets, n, index, generator):
+    """Positions and fields of n random rows for each value of a column,
+    through a reservoir for each value
+
+    :param datasets: iterable of Dataset objects
+    :param n: number of rows per value
+    :param index: column index
+    :param generator: Random object
+    :return: list of tuple
+    """
+    strata = {}
+    counts = Counter()
+    position = 0
+    for data in datasets:
+        for fields in _iter_fields(data):
+            key = fields[index]
+            counts[key] += 1
+            reservoir = strata.setdefault(key, [])
+            if len(reservoir) < n:
+                reservoir.append((position, list(fields)))
+            else:
+                replaced = generator.randrange(counts[key])
+                if replaced < n:
+                    reservoir[replaced] = (position, list(fields))
+            position += 1
+    return list(chain_iterables.from_iterable(strata.values()))
+
+
+def sample(data, n, method="reservoir", by=None, seed=None):
+    """
+    Random sample of rows in a single pass, without reading all rows:
+    reservoir (n rows), bernoulli (each row with probability n)
+    or stratified (n rows for each value of the by column)
+
+    :param data: Dataset object, or iterable of Dataset objects (chunks)
+    :param n: number of rows (per value of by, if stratified); fraction of rows if bernoulli
+    :param method: reservoir, bernoulli or stratified
+    :param by: column of strata, if stratified
+    :param seed: seed of random generator
+    :return: Dataset
+    """
+    if method not in SAMPLES:
+        raise DataObjectError(f"{method} is not one of {SAMPLES}")
+    if method == "bernoulli" and not 0 <= n <= 1:
+        raise DataObjectError("the fraction of rows must be between 0 and 1")
+    if method == "stratified" and by is None:
+        raise DataObjectError("stratified sample needs the by column")
+    generator = random.Random(seed)
+    datasets = iter([data] if isinstance(data, Dataset) else data)
+    first = next(datasets, None)
+    headers = first.headers if first is not None else None
+    datasets = chain_iterables([first] if first is not None else [], datasets)
+    if method == "reservoir":
+        rows = _reservoir(datasets, max(0, n), generator)
+    elif method == "bernoulli":
+        rows = _bernoulli(datasets, n, generator)
+    else:
+        rows = _stratified(datasets, n, _column_index(headers, by), generator)
+    # Rows in the order of data
+    rows.sort(key=operator.itemgetter(0))
+    if isinstance(data, ColumnarDataset):
+        return data.take([position for position, _ in rows])
+    new_data = Dataset(title=data.title if isinstance(data, Dataset) else None)
+    new_data._data = [Row(fields) for _, fields in rows]
+    new_data.headers = headers
+    return new_data
 
 
 def deduplicate(data: Dataset):
@@ -1,7 +1,9 @@
 import unittest
-
+from unittest import mock
 
 import pyreports
+import pyreports.cli
+import tablib
 from tablib import Dataset
 from tempfile import gettempdir
 
@@ -67,6 +69,45 @@ class TestExecutor(unittest.TestCase):
         self.assertEqual(self.data.get_data()[0], ("Arthur", "Dent", 42))
         self.data.reset()
 
+    def test_filter_by_key_and_column_single_pass(self):
+        calls = []
+
+        def is_answer(number):
+            calls.append(number)
+            return number == 42
+
+        data = pyreports.Executor(
+            Dataset(*[("Arthur", "Dent", 42), ("Ford", "Prefect", 43)] * 50),
+            header=["name", "surname", "age"],
+        )
+        data.filter(key=is_answer, column="age")
+        self.assertEqual(len(data), 50)
+        self.assertEqual(len(calls), 100)
+        self.assertEqual(data.headers, ["name", "surname", "age"])
+
+    def test_filter_by_unhashable_list(self):
+        data = pyreports.Executor(Dataset(["Arthur", ["Dent"], 42], ["Ford", [], 42]))
+        data.filter([["Dent"]])
+        self.assertEqual(data.get_data()[0], ("Arthur", ["Dent"], 42))
+        self.assertEqual(len(data), 1)
+
+    def test_filter_selection(self):
+        dataset = Dataset(
+            ("Arthur", "Dent", 42), ("Ford", "Prefect", 42), ("Tricia", "McMillan", 30)
+        )
+        data = pyreports.Executor(dataset, header=["name", "surname", "age"])
+        data.filter([42], column="age")
+        data.filter(key=lambda name: name.startswith("F"), column="name")
+        # Rows are only selected, not copied
+        self.assertEqual(list(data.selection), [1])
+        self.assertEqual(list(data.origin), list(dataset))
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0], ("Ford", "Prefect", 42))
+        self.assertEqual(list(data), [("Ford", "Prefect", 42)])
+        self.assertEqual(data.select_column("surname"), ["Prefect"])
+        self.assertEqual(data.get_data()[0], ("Ford", "Prefect", 42))
+        self.assertIsNone(data.selection)
+
     def test_map(self):
         def int_to_string(number):
             if isinstance(number, int):
@@ -81,6 +122,334 @@ class TestExecutor(unittest.TestCase):
         self.assertEqual(self.data.get_data()[2], ("Ford", "Prefect", "42"))
         self.data.reset()
 
+    def test_map_column(self):
+        data = pyreports.Executor(
+            Dataset(("Arthur", "Dent", 42), ("Ford", "Prefect", 43)),
+            header=["name", "surname", "age"],
+        )
+        data.map(str, column="age")
+        self.assertEqual(data.get_data()[0], ("Arthur", "Dent", "42"))
+        data.map(str.upper, column=["name", 1])
+        self.assertEqual(data.get_data()[1], ("FORD", "PREFECT", "43"))
+        data.map({"name": str.lower, "age": int})
+        self.assertEqual(data.get_data()[1], ("ford", "PREFECT", 43))
+        self.assertEqual(data.headers, ["name", "surname", "age"])
+        self.assertRaises(
+            pyreports.exception.ExecutorDataError, data.map, {"age": None}
+        )
+
+    def test_map_workers(self):
+        data = pyreports.Executor(
+            Dataset(*[("arthur", "dent", 42), ("ford", "prefect", 42)] * 50),
+            header=["name", "surname", "age"],
+        )
+        data.map(str.title, column=["name", "surname"], workers=2, chunksize=7)
+        self.assertEqual(len(data), 100)
+        self.assertEqual(data[0], ("Arthur", "Dent", 42))
+        self.assertEqual(data[99], ("Ford", "Prefect", 42))
+        # Functions that can't be sent to processes run in this process
+        with self.assertWarns(RuntimeWarning):
+            data.map(lambda age: age + 1, column="age", workers=2)
+        self.assertEqual(data[0], ("Arthur", "Dent", 43))
+        for chunksize in (0, -1, None):
+            with self.assertRaises(pyreports.exception.ExecutorError):
+                data.map(str.upper, column="name", workers=2, chunksize=chunksize)
+        self.assertEqual(data[0], ("Arthur", "Dent", 43))
+
+    def test_map_async(self):
+        import asyncio
+
+        async def lookup(name):
+            await asyncio.sleep(0.01 if name == "arthur" else 0)
+            return name.title()
+
+        data = pyreports.Executor(
+            Dataset(("arthur", "dent", 42), ("ford", "prefect", 42)),
+            header=["name", "surname", "age"],
+        )
+        data.map(lookup, column="name", concurrency=1)
+        self.assertEqual(data[0], ("Arthur", "dent", 42))
+        self.assertEqual(data[1], ("Ford", "prefect", 42))
+        asyncio.run(data.amap({"surname": lookup, "age": str}))
+        self.assertEqual(data[0], ("Arthur", "Dent", "42"))
+        self.assertEqual(data[1], ("Ford", "Prefect", "42"))
+
+        async def in_loop():
+            data.map(lookup)
+
+        with self.assertRaises(pyreports.exception.ExecutorError):
+            asyncio.run(in_loop())
+        # Lazy plans are checked when they run
+        data = pyreports.Executor(
+            Dataset(*[("arthur", "dent", 42)] * 30),
+            header=["name", "surname", "age"],
+            lazy=True,
+        )
+        data.map(lookup, column="name", concurrency=4)
+
+        async def count():
+            return len(data)
+
+        with self.assertRaises(pyreports.exception.ExecutorError):
+            asyncio.run(count())
+        data.map(lookup, column="name", concurrency=4)
+        self.assertEqual(list(data), [("Arthur", "dent", 42)] * 30)
+
+    def test_map_cache(self):
+        calls = []
+
+        def department(name):
+            calls.append(name)
+            return name.upper()
+
+        data = pyreports.Executor(
+            Dataset(*[("Arthur", "it"), ("Ford", "hr"), ("Tricia", "it")] * 10),
+            header=["name", "department"],
+        )
+        data.map(department, column="department", cache=1)
+        self.assertEqual(data[2], ("Tricia", "IT"))
+        info = data.cache_info["department"]
+        self.assertEqual(info.hits + info.misses, 30)
+        self.assertEqual(info.misses, len(calls))
+        self.assertEqual(info.maxsize, 1)
+        data.map(department, cache=128)
+        self.assertEqual(data.cache_info[None].misses, 5)
+        with self.assertRaises(pyreports.exception.ExecutorError):
+            data.map(department, cache=128, workers=2)
+        # Equal values of other types are cached apart
+        data = pyreports.Executor(Dataset((1,), (1.0,), (True,)), header=["value"])
+        data.map(repr, column="value", cache=16)
+        self.assertEqual(list(data), [("1",), ("1.0",), ("True",)])
+
+    def test_map_batch(self):
+        import re
+
+        chunks = []
+
+        def to_upper(values):
+            chunks.append(len(values))
+            return "\n".join(values).upper().split("\n")
+
+        data = pyreports.Executor(
+            Dataset(*[("arthur", "dent", 42), ("ford", "prefect", 42)] * 5),
+            header=["name", "surname", "age"],
+        )
+        data.map(to_upper, column=["name", "surname"], batch=4)
+        self.assertEqual(chunks, [4, 4, 4, 4, 2, 2])
+        self.assertEqual(data[0], ("ARTHUR", "DENT", 42))
+        self.assertEqual(data[9], ("FORD", "PREFECT", 42))
+        data.map(
+            lambda values: [re.sub("[AEIOU]", "", str(v)) for v in values], batch=3
+        )
+        self.assertEqual(data[0], ("RTHR", "DNT", "42"))
+        with self.assertRaises(pyreports.exception.ExecutorDataError):
+            data.map(lambda values: values[1:], column="age", batch=3)
+        for batch in (0, -1, 2.5):
+            with self.assertRaises(pyreports.exception.ExecutorError):
+                data.map(lambda values: values, batch=batch)
+        self.assertEqual(len(data), 10)
+
+    def test_index(self):
+        data = pyreports.Executor(
+            Dataset(
+                ("Arthur", "Dent", 42), ("Ford", "Prefect", 42), ("Tricia", "Dent", 40)
+            ),
+            header=["name", "surname", "age"],
+        )
+        # Every row is checked, not only the first one
+        self.assertTrue("Tricia" in data)
+        self.assertFalse("Marvin" in data)
+        self.assertFalse(["Marvin"] in data)
+        self.assertEqual(
+            data.lookup("Dent", "surname"),
+            [("Arthur", "Dent", 42), ("Tricia", "Dent", 40)],
+        )
+        data.filter(["Dent", "Marvin"], column="surname")
+        self.assertEqual(list(data.selection), [0, 2])
+        self.assertFalse("Ford" in data)
+        self.assertEqual(data.lookup(42, "age"), [("Arthur", "Dent", 42)])
+        data.filter([40], column=2)
+        self.assertEqual(list(data), [("Tricia", "Dent", 40)])
+        # Indexes of changed data are built again
+        data.reset()
+        data + ("Marvin", "Android", 1000000)
+        self.assertTrue("Marvin" in data)
+        self.assertEqual(len(data.lookup("Android", 1)), 1)
+        # Changes from outside are not missed by indexes
+        dataset = Dataset(("Arthur", "Dent"), ("Ford", "Prefect"))
+        data = pyreports.Executor(dataset, header=["name", "surname"])
+        self.assertEqual(data.lookup("Ford", "name"), [("Ford", "Prefect")])
+        self.assertTrue("Ford" in data)
+        dataset.append(("Zaphod", "Beeblebrox"))
+        data.filter(["Zaphod"], column="name")
+        self.assertEqual(list(data), [("Zaphod", "Beeblebrox")])
+        data.reset()
+        self.assertEqual(data.lookup("Ford", "name"), [("Ford", "Prefect")])
+        data.get_data().append(("Tricia", "McMillan"))
+        self.assertEqual(data.lookup("Tricia", "name"), [("Tricia", "McMillan")])
+        self.assertTrue("McMillan" in data)
+        # Handed out data is still indexed; membership tests index after the first one
+        self.assertEqual(data.lookup("Arthur", "name"), [("Arthur", "Dent")])
+        self.assertIn(0, data._indexes)
+        self.assertTrue("Dent" in data)
+        self.assertIn(1, data._indexes)
+        self.assertFalse("Marvin" in data)
+        del data.get_data()[0]
+        data.get_data().append(("Marvin", "Android"))
+        self.assertTrue("Marvin" in data)
+        self.assertEqual(data.lookup("Arthur", "name"), [])
+
+    def test_group_by(self):
+        data = pyreports.Executor(
+            Dataset(("Arthur", "it", 42), ("Ford", "hr", 42), ("Tricia", "it", 40)),
+            header=["name", "department", "age"],
+        )
+        data.filter([40, 42], column="age")
+        grouped = data.group_by("department").agg({"age": "mean", "name": "count"})
+        self.assertEqual(grouped.headers, ["department", "age_mean", "name_count"])
+        self.assertEqual(list(grouped), [("it", 41.0, 2), ("hr", 42.0, 1)])
+
+    def test_join(self):
+        data = pyreports.Executor(
+            Dataset(("Arthur", "Dent"), ("Ford", "Prefect"), ("Tricia", "McMillan")),
+            header=["name", "surname"],
+        )
+        users = pyreports.Executor(
+            Dataset(("adent", "Dent", "Arthur"), ("fprefect", "Prefect", "Ford")),
+            header=["uid", "surname", "name"],
+        )
+        data.filter(["Tricia"], negation=True)
+        data.join(users, ["name", "surname"], how="left")
+        self.assertEqual(data.headers, ["name", "surname", "uid"])
+        self.assertEqual(
+            list(data), [("Arthur", "Dent", "adent"), ("Ford", "Prefect", "fprefect")]
+        )
+        data.reset()
+        data.join(users.get_data(), "surname", how="anti")
+        self.assertEqual(list(data), [("Tricia", "McMillan")])
+        with self.assertRaises(pyreports.exception.ExecutorError):
+            data.join([("Arthur", "Dent")], "surname")
+        # Streamed chunks of other data
+        data.reset()
+        chunks = (users.get_data().subset(rows=[i]) for i in range(2))
+        data.join(chunks, ["name", "surname"], how="left")
+        self.assertEqual(
+            list(data),
+            [
+                ("Arthur", "Dent", "adent"),
+                ("Ford", "Prefect", "fprefect"),
+                ("Tricia", "McMillan", None),
+            ],
+        )
+        data.reset()
+        chunks = (users.get_data().subset(rows=[i]) for i in range(2))
+        data.join(chunks, "surname", how="semi")
+        self.assertEqual(list(data), [("Arthur", "Dent"), ("Ford", "Prefect")])
+
+    def test_top_k(self):
+        data = pyreports.Executor(
+            Dataset(("Arthur", 42), ("Ford", 43), ("Tricia", 40), ("Zaphod", 44)),
+            header=["name", "age"],
+        )
+        data.filter(["Zaphod"], column="name", negation=True)
+        data.top_k("age", 2, reverse=True)
+        self.assertEqual(list(data), [("Ford", 43), ("Arthur", 42)])
+
+    def test_filter_expression(self):
+        rows = [("Arthur", "it", 42), ("Ford", "hr", 43), ("Tricia", "it", 40)]
+        for data in (Dataset(*rows), pyreports.columnar(Dataset(*rows))):
+            ex = pyreports.Executor(data, header=["name", "department", "age"])
+            ex.filter(key="age >= 42 and department == 'it' or name == 'Ford'")
+            self.assertEqual(list(ex.selection), [0, 1])
+            ex.reset()
+            # Evaluated on whole columns, when numeric
+            ex.filter(key=pyreports.Expression("40 < age < 43"), negation=True)
+            self.assertEqual([row[0] for row in ex], ["Ford", "Tricia"])
+        with self.assertRaises(pyreports.exception.ExecutorError):
+            ex.filter(["Ford"], key="age > 40")
+        with self.assertRaises(pyreports.DataObjectError):
+            ex.filter(key="__import__('os').system('ls')")
+
+    def test_partition(self):
+        rows = [("Arthur", "it", 42), ("Ford", "hr", 43), ("Tricia", "it", 40)]
+        for data in (Dataset(*rows), pyreports.columnar(Dataset(*rows))):
+            ex = pyreports.Executor(data, header=["name", "department", "age"])
+            ex.filter(["Arthur"], column="name", negation=True)
+            parts = ex.partition(
+                {
+                    "it": "department == 'it'",
+                    "old": "age > 40",
+                    "short": lambda row: len(row[0]) <= 4,
+                },
+                rest="others",
+            )
+            self.assertEqual(list(parts["it"]), [("Tricia", "it", 40)])
+            self.assertEqual(list(parts["old"]), [("Ford", "hr", 43)])
+            self.assertEqual(list(parts["short"]), [("Ford", "hr", 43)])
+            self.assertEqual(len(parts["others"]), 0)
+            self.assertEqual(parts["it"].headers, ["name", "department", "age"])
+            # Data is not changed
+            self.assertEqual(len(ex), 2)
+        self.assertNotIn("others", ex.partition({"old": "age > 40"}))
+
+    def test_add_dataset(self):
+        dataset = Dataset(("Arthur", "Dent", 42))
+        data = pyreports.Executor(dataset, header=["name", "surname", "age"])
+        data + Dataset(("Ford", "Prefect", 42), ("Tricia", "McMillan", 40))
+        self.assertEqual(len(data), 3)
+        self.assertEqual(data[2], ("Tricia", "McMillan", 40))
+        self.assertEqual(len(dataset), 1)
+        with self.assertRaises(tablib.InvalidDimensions):
+            data + Dataset(("Marvin", "Android"))
+
+    def test_lazy(self):
+        calls = []
+
+        def to_upper(value):
+            calls.append(value)
+            return value.upper()
+
+        data = pyreports.Executor(
+            Dataset(("Arthur", "Dent", 42), ("Ford", "Prefect", 43)),
+            header=["name", "surname", "age"],
+            lazy=True,
+        )
+        data.map(to_upper, column="name")
+        data.filter([42], column="age")
+        data.add_column("planet", lambda row: "Heart")
+        data.del_column("surname")
+        # Nothing runs until data is requested
+        self.assertEqual(calls, [])
+        self.assertEqual(len(data.plan), 4)
+        self.assertEqual(data.plan[0].kind, "filter")
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data.plan, [])
+        self.assertEqual(calls, ["Arthur"])
+        self.assertEqual(data.get_data()[0], ("ARTHUR", 42, "Heart"))
+        self.assertEqual(data.headers, ["name", "age", "planet"])
+
+    def test_lazy_error(self):
+        data = pyreports.Executor(
+            Dataset(("Arthur", 42, 2), ("Ford", 43, 0)),
+            header=["name", "age", "floor"],
+            lazy=True,
+        )
+        data.map(lambda value: 1 / value, column="floor")
+        data.filter(key=lambda age: age > 40, column="age")
+        # A failed plan raises again, instead of returning untransformed data
+        for _ in range(2):
+            with self.assertRaises(ZeroDivisionError):
+                data.get_data()
+        self.assertEqual(len(data.plan), 2)
+        data.reset()
+        self.assertEqual(data.get_data()[1], ("Ford", 43, 0))
+        # Not lazy: error is raised by the operation, that is discarded
+        data.lazy = False
+        with self.assertRaises(ZeroDivisionError):
+            data.map(lambda value: 1 / value, column="floor")
+        self.assertEqual(data.plan, [])
+        self.assertEqual(data.get_data()[1], ("Ford", 43, 0))
+
     def test_select_column(self):
         self.data.headers = ["name", "surname", "age"]
         self.data.data.append(["Arthur", "Dent", 42])
@@ -103,6 +472,40 @@ class TestExecutor(unittest.TestCase):
         self.assertIsInstance(new_data, pyreports.Executor)
         self.assertEqual(type(new_data), type(self.data))
 
+    def test_copy_on_write(self):
+        dataset = Dataset(("Arthur", "Dent", 42), headers=["name", "surname", "age"])
+        data = pyreports.Executor(dataset, header=dataset.headers)
+        # Nothing is copied until data changes, except the list of rows of origin
+        self.assertIs(data.get_data(), dataset)
+        self.assertIsNot(data.origin, dataset)
+        self.assertEqual(list(data.origin), list(dataset))
+        data.add_column("planet", ["Heart"])
+        self.assertIsNot(data.get_data(), dataset)
+        self.assertEqual(dataset.headers, ["name", "surname", "age"])
+        self.assertEqual(dataset[0], ("Arthur", "Dent", 42))
+        # Changes of handed out Datasets don't change origin
+        data.reset()
+        data.get_data().append(("Ford", "Prefect", 42))
+        self.assertEqual(len(data), 2)
+        dataset.append(("Tricia", "McMillan", 30))
+        data.reset()
+        self.assertEqual(list(data), [("Arthur", "Dent", 42)])
+        self.assertEqual(len(data.clone()), 1)
+        self.assertEqual(len(dataset), 2)
+        # Rows handed out are not the rows of origin
+        data = pyreports.Executor(
+            [("Arthur", 42), ("Ford", 43)], header=["name", "age"]
+        )
+        data.get_data().append_col([1, 2], header="floor")
+        data.reset()
+        self.assertEqual(list(data), [("Arthur", 42), ("Ford", 43)])
+        data.data.append_col([1, 2], header="floor")
+        data.origin.append_col([1, 2], header="floor")
+        data.clone().get_data().append_col([1, 2], header="floor")
+        data.reset()
+        self.assertEqual(data.headers, ["name", "age"])
+        self.assertEqual(data.lookup(43, "age"), [("Ford", 43)])
+
     def test_add_row(self):
         fake_data = self.data.clone()
         self.assertRaises(
@@ -148,6 +551,62 @@ class TestReport(unittest.TestCase):
         self.assertEqual(self.report.count, 1)
         self.report.negation = False
 
+    def test_exec_expression(self):
+        data = Dataset(
+            *[("Matteo", "IT", 35), ("Arthur", "HR", 42), ("Ford", "OPS", 43)]
+        )
+        data.headers = ["name", "department", "age"]
+        report = pyreports.Report(
+            input_data=data, filters="age > 40 and department in ('IT', 'HR')"
+        )
+        report.exec()
+        self.assertEqual(list(report.report), [("Arthur", "HR", 42)])
+
+    def test_exec_limit(self):
+        data = Dataset(
+            *[("Ford", "OPS", 43), ("Arthur", "HR", 42), ("Matteo", "HR", 35)],
+            *[("Trillian", "HR", 30), ("Zaphod", "OPS", 50)],
+            headers=["name", "department", "age"],
+        )
+        report = pyreports.Report(
+            input_data=data, filters="department == 'HR'", limit=2, count=True
+        )
+        report.exec()
+        self.assertEqual(
+            list(report.report), [("Arthur", "HR", 42), ("Matteo", "HR", 35)]
+        )
+        self.assertEqual(report.count, 2)
+
+    def test_cli_limit_with_filters(self):
+        input_file = f"{tmp_folder}/test_cli_limit.csv"
+        output_file = f"{tmp_folder}/test_cli_limit_report.csv"
+        config_file = f"{tmp_folder}/test_cli_limit.yml"
+        with open(input_file, "w") as file:
+            file.write("name,department,age\n")
+            file.write("Zaphod,OPS,50\nFord,OPS,43\nArthur,HR,42\n")
+            file.write("Matteo,HR,35\nTrillian,HR,30\n")
+        with open(config_file, "w") as file:
+            file.write(
+                "reports:\n"
+                "- report:\n"
+                "    title: Top HR\n"
+                "    input:\n"
+                "      manager: csv\n"
+                f"      filename: {input_file}\n"
+                "    output:\n"
+                "      manager: csv\n"
+                f"      filename: {output_file}\n"
+                "    filters: department == 'HR'\n"
+                "    sort:\n"
+                "      column: age\n"
+                "      reverse: true\n"
+                "      limit: 2\n"
+            )
+        with mock.patch("sys.argv", ["reports", config_file]):
+            pyreports.cli.main()
+        report = pyreports.manager("csv", output_file).read()
+        self.assertEqual(report["name"], ["Arthur", "Matteo"])
+
     def test_export(self):
         self.report.export()
         self.assertIsInstance(self.report.output.read(), Dataset)
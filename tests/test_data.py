@@ -1,6 +1,9 @@
+import pickle
 import unittest
 
 import tablib
+from array import array
+from collections import Counter
 
 import pyreports
 from tablib import Dataset
@@ -17,6 +20,31 @@ class TestDataTools(unittest.TestCase):
 
     def test_most_common(self):
         self.assertEqual(pyreports.most_common(self.data, "age"), 42)
+        self.assertEqual(pyreports.most_common(self.data, 2, 5), [(42, 2), (35, 1)])
+        printers = pyreports.DataPrinters(self.data)
+        self.assertEqual(printers.most_common("surname", 1), [("Guadrini", 1)])
+        # Unhashable elements
+        data = Dataset((["a", "b"],), (["c"],), (["a", "b"],))
+        self.assertEqual(pyreports.most_common(data, 0), ["a", "b"])
+        self.assertEqual(
+            pyreports.most_common(data, 0, 5), [(["a", "b"], 2), (["c"], 1)]
+        )
+
+    def test_heavy_hitters(self):
+        values = [index % 50 for index in range(1000)] + [7] * 500 + [3] * 300
+        data = Dataset(*[(value,) for value in values], headers=["value"])
+        hitters = pyreports.heavy_hitters(data, "value", k=5)
+        self.assertLessEqual(len(hitters), 5)
+        self.assertEqual([value for value, _ in hitters[:2]], [7, 3])
+        # Counts are lower than exact ones by n / (k + 1) at most
+        for value, count in hitters:
+            self.assertLessEqual(count, values.count(value))
+            self.assertGreaterEqual(count, values.count(value) - len(values) / 6)
+        chunks = pyreports.chunks(data, 100)
+        self.assertEqual(pyreports.heavy_hitters(chunks, 0, k=5), hitters)
+        self.assertRaises(
+            pyreports.DataObjectError, pyreports.heavy_hitters, data, 0, 0
+        )
 
     def test_percentage(self):
         self.assertEqual(int(pyreports.percentage(self.data, 42)), 66)
@@ -68,11 +96,49 @@ class TestDataTools(unittest.TestCase):
             list(pyreports.chunks(data, 4))[0][0], ("Matteo", "Guadrini", 35)
         )
 
+    def test_chunk_views(self):
+        for data in (self.data, pyreports.columnar(self.data)):
+            first, last = pyreports.DataAdapters(data).chunks(2)
+            self.assertIsInstance(last, pyreports.DatasetView)
+            self.assertEqual((len(first), len(last)), (2, 1))
+            self.assertEqual(last.headers, ["name", "surname", "age"])
+            self.assertEqual(last[0], ("Ford", "Prefect", 42))
+            self.assertEqual(last[-1], ("Ford", "Prefect", 42))
+            self.assertEqual(first["name"], ["Matteo", "Arthur"])
+            self.assertEqual(list(first), list(data)[:2])
+            self.assertEqual(
+                first.export("csv"),
+                "name,surname,age\r\nMatteo,Guadrini,35\r\nArthur,Dent,42\r\n",
+            )
+            self.assertRaises(IndexError, first.__getitem__, 2)
+            copy = first.copy()
+            copy.append(("Zaphod", "Beeblebrox", 200))
+            self.assertEqual((len(copy), len(first), len(data)), (3, 2, 3))
+
     def test_merge(self):
         self.assertEqual(
             pyreports.merge(self.data, self.data)[3], ("Matteo", "Guadrini", 35)
         )
 
+    def test_chain(self):
+        other = Dataset(("Tricia", "McMillan", 30), headers=self.data.headers)
+        chained = pyreports.chain(self.data, pyreports.columnar(other), self.data)
+        self.assertIsInstance(chained, Dataset)
+        self.assertEqual(chained.headers, ["name", "surname", "age"])
+        self.assertEqual((chained.height, chained.width), (7, 3))
+        self.assertEqual(chained[3], ("Tricia", "McMillan", 30))
+        self.assertEqual(chained[-1], ("Ford", "Prefect", 42))
+        self.assertEqual(chained["age"], [35, 42, 42, 30, 35, 42, 42])
+        self.assertEqual(list(chained)[4], ("Matteo", "Guadrini", 35))
+        self.assertEqual(len(pyreports.Executor(chained, header=chained.headers)), 7)
+        # Rows are copied only when they change
+        chained.append(("Zaphod", "Beeblebrox", 200))
+        self.assertEqual(len(chained), 8)
+        self.assertEqual(len(self.data), 3)
+        self.assertRaises(
+            tablib.InvalidDimensions, pyreports.chain, self.data, Dataset((1, 2))
+        )
+
     def test_deduplication(self):
         data = Dataset(
             *[
@@ -285,6 +351,362 @@ class TestDataTools(unittest.TestCase):
         data.data.headers = ["Name", "Surname", "Age"]
         self.assertEqual(data.percentage(42), 66.66666666666666)
 
+    def test_columnar(self):
+        data = pyreports.columnar(self.data)
+        self.assertIsInstance(data, tablib.Dataset)
+        self.assertTrue(data.columnar)
+        self.assertEqual(data["age"], [35, 42, 42])
+        self.assertEqual(data.get_col(0), ["Matteo", "Arthur", "Ford"])
+        self.assertEqual(data[1], ("Arthur", "Dent", 42))
+        self.assertEqual(list(data), list(self.data))
+        self.assertEqual(str(data), str(self.data))
+        self.assertEqual(data.export("csv"), self.data.export("csv"))
+        self.assertEqual(
+            pyreports.average(data, "age"), pyreports.average(self.data, "age")
+        )
+        data.append_col([1, 2, 3], header="floor")
+        del data["surname"]
+        self.assertEqual(data.headers, ["name", "age", "floor"])
+        self.assertEqual(data[2], ("Ford", 42, 3))
+        self.assertTrue(data.columnar)
+        # Row operations move data into rows
+        data.append(("Tricia", 30, 4))
+        self.assertFalse(data.columnar)
+        self.assertEqual(data["age"], [35, 42, 42, 30])
+        # Rows must have the same length, like Dataset
+        self.assertRaises(
+            tablib.InvalidDimensions,
+            pyreports.ColumnarDataset,
+            ("Arthur", 42),
+            ("Ford",),
+        )
+
+    def test_columnar_without_numpy(self):
+        numpy = pyreports.datatools.numpy
+        pyreports.datatools.numpy = None
+        try:
+            data = pyreports.ColumnarDataset(
+                ("Arthur", 42, 1.5), ("Ford", 42, 2.5), headers=["name", "age", "x"]
+            )
+            self.assertIsInstance(data.get_array("age"), array)
+            self.assertIsInstance(data.get_array("name"), list)
+            self.assertEqual(data["x"], [1.5, 2.5])
+        finally:
+            pyreports.datatools.numpy = numpy
+
+    def test_columnar_executor(self):
+        data = pyreports.Executor(
+            pyreports.columnar(self.data), header=self.data.headers
+        )
+        data.filter([42], column="age")
+        data.map(str.upper, column="name")
+        self.assertIsInstance(data.get_data(), pyreports.ColumnarDataset)
+        self.assertEqual(list(data), [("ARTHUR", "Dent", 42), ("FORD", "Prefect", 42)])
+        data.reset()
+        data.filter([35], column="age")
+        self.assertEqual(data.get_data()[0], ("Matteo", "Guadrini", 35))
+        self.assertTrue(data.get_data().columnar)
+
+    def test_columnar_printers(self):
+        data = pyreports.DataPrinters(pyreports.columnar(self.data))
+        self.assertEqual(data.average("age"), 39.666666666666664)
+        self.assertEqual(data.most_common("age"), 42)
+        self.assertEqual(len(data), 3)
+
+    def test_describe(self):
+        stats = pyreports.describe(self.data, "age")
+        self.assertEqual(stats["count"], 3)
+        self.assertEqual(stats["sum"], 119)
+        self.assertEqual(stats["min"], 35)
+        self.assertEqual(stats["max"], 42)
+        self.assertAlmostEqual(stats["mean"], 39.666666666666664)
+        self.assertAlmostEqual(stats["std"], 3.2998316455372216)
+        self.assertEqual(pyreports.describe(self.data, 2, "max"), {"max": 42})
+        self.assertRaises(pyreports.DataObjectError, pyreports.describe, self.data, 0)
+        self.assertRaises(
+            pyreports.DataObjectError, pyreports.describe, self.data, 2, "median"
+        )
+
+    def test_describe_without_numpy(self):
+        numpy = pyreports.datatools.numpy
+        pyreports.datatools.numpy = None
+        try:
+            stats = pyreports.describe(pyreports.columnar(self.data), "age")
+            self.assertEqual(stats["sum"], 119)
+            self.assertAlmostEqual(stats["std"], 3.2998316455372216)
+        finally:
+            pyreports.datatools.numpy = numpy
+
+    def test_group_by(self):
+        def product(result, value):
+            return result * value
+
+        grouped = pyreports.group_by(self.data, "age").agg(
+            {"age": ["count", "sum", "mean", product], "name": ["first", "last"]}
+        )
+        self.assertEqual(
+            grouped.headers,
+            [
+                "age",
+                "age_count",
+                "age_sum",
+                "age_mean",
+                "age_product",
+                "name_first",
+                "name_last",
+            ],
+        )
+        self.assertEqual(grouped[0], (35, 1, 35, 35.0, 35, "Matteo", "Matteo"))
+        self.assertEqual(grouped[1], (42, 2, 84, 42.0, 1764, "Arthur", "Ford"))
+        self.assertRaises(
+            pyreports.DataObjectError,
+            pyreports.group_by(self.data, "age").agg,
+            {"age": "median"},
+        )
+        # Chunks are aggregated one at a time
+        chunks = (self.data.subset(rows=[index]) for index in range(3))
+        grouped = pyreports.group_by(chunks, "age", 1).agg({"age": ["min", "max"]})
+        self.assertEqual(grouped.headers, ["age", "surname", "age_min", "age_max"])
+        self.assertEqual(len(grouped), 3)
+        grouped = pyreports.group_by(pyreports.columnar(self.data), 2).agg({0: "last"})
+        self.assertEqual(list(grouped), [(35, "Matteo"), (42, "Ford")])
+
+    def test_join(self):
+        floors = Dataset(("Dent", 1), ("Prefect", 2), ("Dent", 3), ("Beeblebrox", 4))
+        floors.headers = ["surname", "floor"]
+        joined = pyreports.join(self.data, floors, "surname")
+        self.assertEqual(joined.headers, ["name", "surname", "age", "floor"])
+        self.assertEqual(
+            list(joined),
+            [
+                ("Arthur", "Dent", 42, 1),
+                ("Arthur", "Dent", 42, 3),
+                ("Ford", "Prefect", 42, 2),
+            ],
+        )
+        # Same rows, hashing the left Dataset
+        self.assertEqual(
+            list(pyreports.join(self.data.subset(rows=[1, 2]), floors, "surname")),
+            list(joined),
+        )
+        left = pyreports.join(self.data, floors, "surname", how="left")
+        self.assertEqual(left[0], ("Matteo", "Guadrini", 35, None))
+        self.assertEqual(len(left), 4)
+        semi = pyreports.join(self.data, floors, ["surname"], how="semi")
+        self.assertEqual(semi.headers, self.data.headers)
+        self.assertEqual(semi["name"], ["Arthur", "Ford"])
+        anti = pyreports.join(self.data, floors, "surname", how="anti")
+        self.assertEqual(anti["name"], ["Matteo"])
+        # Same rows, hashing the smaller left Dataset
+        small = self.data.subset(rows=[0, 2])
+        self.assertEqual(
+            list(pyreports.join(small, floors, "surname", how="left")),
+            [("Matteo", "Guadrini", 35, None), ("Ford", "Prefect", 42, 2)],
+        )
+        semi = pyreports.join(small, floors, "surname", how="semi")
+        self.assertEqual(semi["name"], ["Ford"])
+        anti = pyreports.join(small, floors, "surname", how="anti")
+        self.assertEqual(anti["name"], ["Matteo"])
+        self.assertRaises(
+            pyreports.DataObjectError, pyreports.join, self.data, floors, 1, "outer"
+        )
+        # Right rows without headers
+        joined = pyreports.join(self.data, Dataset((1, "Dent")), 1)
+        self.assertIsNone(joined.headers)
+        self.assertEqual(list(joined), [("Arthur", "Dent", 42, 1)])
+        # Chunks streamed through the hash table of floors
+        chunks = pyreports.join(pyreports.chunks(self.data, 2), floors, "surname")
+        chunks = list(chunks)
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual(chunks[1].headers, ["name", "surname", "age", "floor"])
+        self.assertEqual(list(chunks[0]) + list(chunks[1]), list(left)[1:])
+
+    def test_external_sort(self):
+        data = Dataset(*[(index % 7, index % 3, index) for index in range(100)])
+        data.headers = ["seven", "three", "index"]
+        expected = sorted(data, key=lambda row: (row[0], -row[1]))
+        # Runs of 8 rows merged from temporary files
+        rows = pyreports.external_sort(
+            data, ["seven", "three"], reverse=[False, True], buffer=8
+        )
+        self.assertEqual(list(rows), expected)
+        chunks = (data.subset(rows=range(i, i + 10)) for i in range(0, 100, 10))
+        rows = list(pyreports.external_sort(chunks, 2, reverse=True, buffer=30))
+        self.assertEqual([row[2] for row in rows], list(range(99, -1, -1)))
+        self.assertEqual(
+            list(pyreports.external_sort(self.data, "age")),
+            list(self.data.sort("age")),
+        )
+        self.assertRaises(
+            pyreports.DataObjectError,
+            list,
+            pyreports.external_sort(data, ["seven"], reverse=[True, False]),
+        )
+
+    def test_top_k(self):
+        data = Dataset(*[(index, index % 5, float(index % 7)) for index in range(50)])
+        data.headers = ["index", "five", "seven"]
+        for source in (data, pyreports.columnar(data)):
+            for column in ("five", "seven"):
+                for reverse in (False, True):
+                    top = pyreports.top_k(source, column, 8, reverse=reverse)
+                    self.assertEqual(top.headers, data.headers)
+                    self.assertEqual(
+                        list(top), list(data.sort(column, reverse=reverse))[:8]
+                    )
+        self.assertEqual(len(pyreports.top_k(data, 0, 100)), 50)
+        self.assertEqual(len(pyreports.top_k(data, 0, 0)), 0)
+        self.assertEqual(
+            pyreports.DataAdapters(self.data).top_k("age", 1, reverse=True)["name"],
+            ["Arthur"],
+        )
+
+    def test_sample(self):
+        data = Dataset(*[(index, index % 3) for index in range(1000)])
+        data.headers = ["index", "three"]
+        for source in (data, pyreports.columnar(data)):
+            rows = pyreports.sample(source, 10, seed=42)
+            self.assertEqual(rows.headers, data.headers)
+            self.assertEqual(len(rows), 10)
+            self.assertEqual(list(rows), sorted(set(rows)))
+            self.assertEqual(list(rows), list(pyreports.sample(source, 10, seed=42)))
+        self.assertEqual(len(pyreports.sample(data, 2000)), 1000)
+        self.assertEqual(len(pyreports.sample(data, 0)), 0)
+        # Streaming source
+        rows = pyreports.sample(pyreports.chunks(data, 64), 10, seed=42)
+        self.assertEqual(list(rows), list(pyreports.sample(data, 10, seed=42)))
+        self.assertEqual(len(pyreports.sample(data, 1.0, "bernoulli")), 1000)
+        self.assertEqual(len(pyreports.sample(data, 0.0, "bernoulli")), 0)
+        self.assertAlmostEqual(
+            len(pyreports.sample(data, 0.2, "bernoulli", seed=1)), 200, delta=50
+        )
+        rows = pyreports.DataAdapters(data).sample(5, "stratified", by="three")
+        self.assertEqual(Counter(rows["three"]), {0: 5, 1: 5, 2: 5})
+        self.assertRaises(pyreports.DataObjectError, pyreports.sample, data, 5, "all")
+        self.assertRaises(
+            pyreports.DataObjectError, pyreports.sample, data, 5, "bernoulli"
+        )
+        self.assertRaises(
+            pyreports.DataObjectError, pyreports.sample, data, 5, "stratified"
+        )
+
+    def test_expression(self):
+        expression = pyreports.Expression("age > 40 and name not in ('Ford',)")
+        self.assertEqual(expression.names, ["age", "name"])
+        self.assertEqual(expression.columns(self.data.headers), {"age": 2, "name": 0})
+        predicate = expression.predicate(self.data.headers)
+        self.assertEqual([predicate(row) for row in self.data], [False, True, False])
+        # Strings can't be compared through NumPy
+        self.assertIsNone(expression.vector(self.data.headers))
+        vector = pyreports.Expression("age * 2 > 80").vector(self.data.headers)
+        self.assertEqual(vector(self.data).tolist(), [False, True, True])
+        self.assertIsNone(
+            pyreports.Expression("name > 1").vector(self.data.headers)(self.data)
+        )
+        self.assertFalse(pyreports.Expression("name > 1").predicate(["name"])(["a"]))
+        # Boolean operators on float columns
+        data = Dataset((0.0, 41), (1.5, 30), (0.0, 20), headers=["f", "a"])
+        for text, expected in (
+            ("f or a > 40", [True, True, False]),
+            ("not f", [True, False, True]),
+        ):
+            expression = pyreports.Expression(text)
+            predicate = expression.predicate(data.headers)
+            self.assertEqual([predicate(row) for row in data], expected)
+            vector = expression.vector(data.headers)
+            self.assertEqual(vector(pyreports.columnar(data)).tolist(), expected)
+        # Division by zero is False, through rows
+        expression = pyreports.Expression("a / (a - 41) > 0")
+        predicate = expression.predicate(data.headers)
+        self.assertEqual([predicate(row) for row in data], [False, False, False])
+        self.assertIsNone(expression.vector(data.headers)(pyreports.columnar(data)))
+        self.assertRaises(pyreports.DataObjectError, pyreports.Expression, "age.real")
+        self.assertRaises(pyreports.DataObjectError, pyreports.Expression, "age >")
+
+    def test_statistics(self):
+        values = [float(value) for value in range(1, 1001)]
+        data = Dataset(*[(value,) for value in values], headers=["latency"])
+        data.append((None,))
+        for source in (pyreports.chunks(data, 100), pyreports.columnar(data)):
+            stats = pyreports.statistics(source, "latency")
+            self.assertEqual(stats.count, 1000)
+            self.assertAlmostEqual(stats.mean, 500.5)
+            self.assertAlmostEqual(stats.variance, 83333.25)
+            self.assertEqual((stats.min, stats.max), (1.0, 1000.0))
+            self.assertAlmostEqual(stats.percentile(50), 500.5, delta=5)
+            self.assertAlmostEqual(stats.percentile(99), 990.5, delta=5)
+            self.assertEqual(stats.percentile(100), 1000.0)
+        self.assertEqual(pyreports.statistics(data, 0).nulls, 1)
+        # Statistics of partitions
+        first, second = pyreports.Statistics(), pyreports.Statistics()
+        first.update(values[:300])
+        second.update(values[300:])
+        first.merge(second)
+        self.assertEqual(first.summary(50)["count"], 1000)
+        self.assertAlmostEqual(first.std, stats.std)
+        self.assertAlmostEqual(first.summary(50)["p50"], 500.5, delta=5)
+        printers = pyreports.DataPrinters(self.data)
+        self.assertEqual(printers.statistics("age").max, 42)
+        self.assertRaises(pyreports.DataObjectError, printers.statistics, "name")
+        self.assertRaises(
+            pyreports.DataObjectError, pyreports.Statistics().percentile, 50
+        )
+
+    def test_approx_distinct(self):
+        self.assertEqual(pyreports.approx_distinct(self.data, "name"), 3)
+        self.assertEqual(pyreports.DataPrinters(self.data).approx_distinct("age"), 2)
+        data = tablib.Dataset(*[(f"host{i % 20000}",) for i in range(50000)])
+        estimate = pyreports.approx_distinct(pyreports.chunks(data, 7000), 0)
+        self.assertAlmostEqual(estimate, 20000, delta=20000 * 0.05)
+        # Counters of partitions
+        first, second = pyreports.HyperLogLog(), pyreports.HyperLogLog()
+        first.update(data.get_col(0)[:30000])
+        second.update(data.get_col(0)[20000:])
+        first.merge(pickle.loads(pickle.dumps(second)))
+        self.assertEqual(len(first), estimate)
+        self.assertRaises(pyreports.DataObjectError, pyreports.HyperLogLog, 20)
+        self.assertRaises(
+            pyreports.DataObjectError, first.merge, pyreports.HyperLogLog(10)
+        )
+
+    def test_comparison(self):
+        greater = pyreports.Comparison(">", 40)
+        self.assertTrue(greater(42))
+        self.assertFalse(greater("Arthur"))
+        self.assertRaises(pyreports.DataObjectError, pyreports.Comparison, "=~", 40)
+        for data in (self.data, pyreports.columnar(self.data)):
+            ex = pyreports.Executor(data, header=data.headers)
+            ex.filter(key=greater, column="age")
+            self.assertEqual(list(ex.selection), [1, 2])
+            ex.filter(key=pyreports.Comparison("==", "Ford"), column="name")
+            self.assertEqual(list(ex), [("Ford", "Prefect", 42)])
+            ex.reset()
+            ex.filter(key=greater, column="age", negation=True)
+            self.assertEqual(list(ex), [("Matteo", "Guadrini", 35)])
+
+    def test_percentages(self):
+        filters = [42, "Ford", 35.0, "Dent", None]
+        for data in (self.data, pyreports.columnar(self.data)):
+            result = pyreports.percentages(data, filters)
+            self.assertEqual(
+                result, {item: pyreports.percentage(data, item) for item in filters}
+            )
+            self.assertEqual(
+                pyreports.percentages(data, ["Dent", 42], column="surname"),
+                {"Dent": 33.33333333333333, 42: 0.0},
+            )
+        data = Dataset(("Arthur", ["Dent"]), ("Ford", ["Prefect"]))
+        self.assertEqual(pyreports.percentages(data, ["Ford"]), {"Ford": 50.0})
+        self.assertEqual(
+            pyreports.DataPrinters(data).percentages(["Ford"], column=0),
+            {"Ford": 50.0},
+        )
+
+    def test_columnar_percentage(self):
+        data = pyreports.columnar(self.data)
+        self.assertEqual(pyreports.percentage(data, 42), 66.66666666666666)
+        self.assertEqual(pyreports.percentage(data, "Ford"), 33.33333333333333)
+
 
 if __name__ == "__main__":
     unittest.main()